@@ -0,0 +1,245 @@
+import http.client
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import argparse
+from urllib.parse import urlsplit, quote
+
+FRONTEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DURATION = 10
+DEFAULT_CONCURRENCY = 16
+PERCENTILES = (50, 95, 99)
+
+# Route mix replayed by every client, as (label, weight); roughly what a browsing visitor requests
+ROUTE_WEIGHTS = (
+    ("catalog", 20),
+    ("game_launcher", 20),
+    ("static", 40),
+    ("apk", 5),
+    ("api_games", 15),
+)
+
+# Fetch a path once and decode the JSON body
+def fetch_json(base_url, path):
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"GET {path} returned {response.status}")
+        return json.loads(body)
+    finally:
+        conn.close()
+
+# Work out which concrete paths each route label should request
+def discover_paths(base_url):
+    catalog = fetch_json(base_url, "/api/games?per_page=100&fields=id,thumbnail")
+    games = catalog["games"]
+    if not games:
+        raise RuntimeError("The catalog is empty, there is nothing to load test")
+
+    static = ["/styles.css", "/script.js", "/games-data.js"]
+    static += ["/" + quote(game["thumbnail"]) for game in games if game.get("thumbnail")]
+
+    # Packaged web builds are only known on disk, so look for them next to the portal
+    apks = []
+    builds_dir = os.path.join(FRONTEND_DIR, "pygbag_builds")
+    if os.path.isdir(builds_dir):
+        for build in sorted(os.listdir(builds_dir)):
+            build_path = os.path.join(builds_dir, build)
+            if os.path.isdir(build_path):
+                apks += [f"/pygbag_builds/{quote(build)}/{quote(name)}"
+                         for name in sorted(os.listdir(build_path)) if name.endswith(".apk")]
+
+    pages = catalog["pages"] if catalog["total"] else 1
+    return {
+        "catalog": ["/", "/about.html"],
+        "game_launcher": [f"/game_launcher?game={quote(game['id'])}" for game in games],
+        "static": static,
+        "apk": apks,
+        "api_games": ["/api/games"] + [f"/api/games?page={page}&per_page=6" for page in range(1, pages + 1)]
+                     + ["/api/games?fields=id,title,thumbnail"],
+    }
+
+# Nearest-rank percentile of an already sorted list
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+class LoadClient(threading.Thread):
+    """One simulated visitor reusing a keep-alive connection"""
+
+    def __init__(self, base_url, paths, deadline, seed):
+        super().__init__(daemon=True)
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.paths = paths
+        self.deadline = deadline
+        self.random = random.Random(seed)
+        self.labels = [label for label, _ in ROUTE_WEIGHTS if paths.get(label)]
+        self.weights = [weight for label, weight in ROUTE_WEIGHTS if paths.get(label)]
+        self.samples = {label: [] for label in self.labels}
+        self.errors = {label: 0 for label in self.labels}
+        self.bytes = {label: 0 for label in self.labels}
+        self.conn = None
+
+    def run(self):
+        while time.monotonic() < self.deadline:
+            label = self.random.choices(self.labels, self.weights)[0]
+            path = self.random.choice(self.paths[label])
+            started = time.perf_counter()
+            try:
+                size = self.request(path)
+            except (OSError, http.client.HTTPException):
+                self.errors[label] += 1
+                self.reset()
+                continue
+            self.samples[label].append(time.perf_counter() - started)
+            if size is None:
+                self.errors[label] += 1
+            else:
+                self.bytes[label] += size
+        self.reset()
+
+    def request(self, path):
+        """Sends one GET and reads the whole body; returns None for error statuses"""
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        self.conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+        response = self.conn.getresponse()
+        body = response.read()
+        if response.will_close:
+            self.reset()
+        return len(body) if response.status < 400 else None
+
+    def reset(self):
+        """Drops the connection so the next request opens a new one"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+# Run the clients and summarize their samples per route
+def run_load(base_url, concurrency, duration, seed=0):
+    paths = discover_paths(base_url)
+    deadline = time.monotonic() + duration
+    clients = [LoadClient(base_url, paths, deadline, seed + index) for index in range(concurrency)]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    routes = {}
+    all_samples = []
+    for label, _ in ROUTE_WEIGHTS:
+        samples = sorted(sample for client in clients for sample in client.samples.get(label, []))
+        if not samples:
+            continue
+        all_samples += samples
+        routes[label] = summarize(samples, elapsed)
+        routes[label]["errors"] = sum(client.errors.get(label, 0) for client in clients)
+        routes[label]["bytes"] = sum(client.bytes.get(label, 0) for client in clients)
+
+    total = summarize(sorted(all_samples), elapsed)
+    total["errors"] = sum(route["errors"] for route in routes.values())
+    total["bytes"] = sum(route["bytes"] for route in routes.values())
+    return {
+        "target": base_url,
+        "concurrency": concurrency,
+        "duration": round(elapsed, 3),
+        "routes": routes,
+        "total": total,
+    }
+
+# Request count, throughput and latency percentiles (milliseconds) of one set of samples
+def summarize(samples, elapsed):
+    summary = {
+        "requests": len(samples),
+        "throughput": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+    }
+    for pct in PERCENTILES:
+        value = percentile(samples, pct)
+        summary[f"p{pct}"] = round(value * 1000, 3) if value is not None else None
+    return summary
+
+# Relative change of every metric against a stored baseline report
+def compare_reports(report, baseline):
+    comparison = {}
+    sections = dict(report["routes"], total=report["total"])
+    base_sections = dict(baseline.get("routes", {}), total=baseline.get("total", {}))
+    for label, current in sections.items():
+        previous = base_sections.get(label)
+        if not previous:
+            continue
+        changes = {}
+        for key in ("throughput",) + tuple(f"p{pct}" for pct in PERCENTILES):
+            if current.get(key) is not None and previous.get(key):
+                changes[key] = f"{(current[key] - previous[key]) / previous[key] * 100:+.1f}%"
+        comparison[label] = changes
+    return comparison
+
+# Start the portal in this process on a free port and return its base URL
+def start_local_server(workers=None):
+    sys.path.insert(0, FRONTEND_DIR)
+    import server
+
+    # Per-request log lines would drown the report
+    class QuietHandler(server.GameHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server.CATALOG.refresh()
+    server.build_frontend()
+    httpd = server.create_server(0, server.MAX_WORKERS if workers is None else workers, handler=QuietHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+def main():
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Load test the Game Collection web portal")
+    parser.add_argument("--url", help="Portal to test (default: start one on a free port)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Number of simulated clients")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="Seconds to keep sending requests")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker threads of the local server (default: the server's own default)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request mix")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    httpd = None
+    base_url = args.url.rstrip("/") if args.url else None
+    if base_url is None:
+        httpd, base_url = start_local_server(args.workers)
+
+    try:
+        report = run_load(base_url, args.concurrency, args.duration, args.seed)
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["baseline"] = compare_reports(report, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+if __name__ == "__main__":
+    main()
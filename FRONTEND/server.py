@@ -1,57 +1,310 @@
 # filepath: c:\Users\offic\OneDrive\Documents\Games\FRONTEND\server.py
+import time
+IMPORT_STARTED = time.perf_counter()
+
 import http.server
 import socketserver
 import os
 import json
 import shutil
 import sys
-import subprocess
-import time
 import threading
-from pathlib import Path
+import argparse
+import hashlib
+import io
+import re
+import bisect
+import selectors
+import socket
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Modules only some requests or options need (gzip, email.utils, subprocess,
+# multiprocessing, pygbag) are imported where they are used to keep startup fast
 
-from matplotlib.pylab import var
+IMPORT_FINISHED = time.perf_counter()
 
 # Configuration
 PORT = 8000
 FRONTEND_DIR = os.path.dirname(os.path.abspath(__file__))
 GAMES_DIR = os.path.dirname(FRONTEND_DIR)
+sys.path.append(GAMES_DIR)  # For game_hooks.py, shared with the desktop launcher
 PYGBAG_DIR = os.path.join(FRONTEND_DIR, "pygbag_builds")
 
-# Create assets directory structure if it doesn't exist
-def setup_asset_directories():
-    # Create game-assets subdirectories for each game
-    game_dirs = [d for d in os.listdir(GAMES_DIR) if os.path.isdir(os.path.join(GAMES_DIR, d)) and d != "FRONTEND" and d != "__pycache__"]
+# Concurrency settings
+MAX_WORKERS = 64  # Maximum number of connections served at the same time
+IDLE_TIMEOUT = 10  # Seconds an idle keep-alive connection is kept open
+
+# Game catalog settings
+THUMBNAIL_NAMES = ["app.png", "app.gif", "screenshot.png", "preview.png"]
+ENTRY_POINT_NAMES = ["main.py", "game.py"]
+CATALOG_POLL_INTERVAL = 2  # Seconds between checks for changed game directories
+PAGE_CACHE_SIZE = 256  # Maximum number of rendered pages kept in memory
+BUILD_MANIFEST_PATH = os.path.join(FRONTEND_DIR, ".cache", "build-manifest.json")
+API_DEFAULT_PER_PAGE = 6  # Matches gamesPerPage in script.js
+API_MAX_PER_PAGE = 100
+API_FIELDS = ("id", "title", "description", "thumbnail", "playUrl", "screenshots", "webReady")  # Keys of game_record()
+
+# Web build settings
+BUILD_HASH_FILE = ".build-hash"  # Written into each pygbag_builds/<slug>/ with the source hash it was built from
+BUILD_TIMEOUT = 900  # Seconds a single pygbag build may take
+BUILD_SKIP_DIRS = ("build", "__pycache__")
+PRECACHE_MANIFEST = "precache-manifest.json"  # Content hashes of a build's files, served next to its index.html
+SERVICE_WORKER = "sw.js"
+# Generated per build and served from pygbag_builds/<slug>/ in place of the build's own files,
+# so the build output itself is never rewritten
+PRECACHE_DIR = os.path.join(FRONTEND_DIR, ".cache", "precache")
+PRECACHE_FILES = ("index.html", PRECACHE_MANIFEST, SERVICE_WORKER)
+SERVICE_WORKER_REGISTRATION = """    <script>
+        // Serve this build from the precache on later visits
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register('sw.js');
+        }
+    </script>
+"""
+CAS_REFERENCE = re.compile(r'"/(cas/[0-9a-f]{64}\.\w+)"')
+
+# Service worker served next to every pygbag build; CACHE_NAME and PRECACHE are filled in per build
+SERVICE_WORKER_TEMPLATE = """// Precaches one pygbag build so returning players start it without the network
+const CACHE_NAME = %(cache_name)s;
+const CACHE_PREFIX = %(cache_prefix)s;
+const PRECACHE = %(urls)s;
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(caches.open(CACHE_NAME)
+        .then((cache) => cache.addAll(PRECACHE.map((url) => new Request(url, { cache: 'reload' }))))
+        .then(() => self.skipWaiting()));
+});
+
+// Drop the caches of earlier versions of this build
+self.addEventListener('activate', (event) => {
+    event.waitUntil(caches.keys()
+        .then((names) => Promise.all(names
+            .filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+            .map((name) => caches.delete(name))))
+        .then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', (event) => {
+    if (event.request.method !== 'GET') {
+        return;
+    }
+    // The page itself is precached as ./, whether it was opened as ./ or ./index.html
+    event.respondWith(caches.open(CACHE_NAME)
+        .then((cache) => cache.match(event.request, { ignoreSearch: true })
+            .then((cached) => cached || (event.request.mode === 'navigate' ? cache.match('./') : undefined)))
+        .then((cached) => cached || fetch(event.request)));
+});
+"""
+
+# Metrics settings
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROUTES = ("/launch-game", "/game-launched", "/game_launcher", "/play-desktop-game",
+          "/api/games", "/api/launches", "/metrics")
+
+# Access log settings
+ACCESS_LOG_QUEUE_SIZE = 10000  # Records waiting for the writer; more are dropped and counted
+ACCESS_LOG_BATCH = 512  # Records written per write() call at most
+ACCESS_LOG_MAX_BYTES = 10 * 1024 * 1024  # Size at which the log is rotated
+ACCESS_LOG_BACKUPS = 5  # Rotated files kept as access.log.1 ... access.log.5
+
+# Launch supervisor settings
+MAX_RUNNING_GAMES = 4  # Game processes the portal may run at the same time
+LAUNCH_HISTORY_SIZE = 50  # Finished launches kept for /api/launches
+LAUNCH_MODES = ("direct", "launcher")  # Run the game itself, or the desktop launcher with --launch
+LAUNCH_EVENTS_PATTERN = re.compile(r"^/api/launches/(\d+)/events(?:\?.*)?$")
+
+# Launch event stream settings
+EVENT_HEARTBEAT_INTERVAL = 15  # Seconds between keep-alive comments on idle event streams
+EVENT_RETRY_MS = 2000  # How long browsers wait before reconnecting a dropped stream
+MAX_EVENT_BACKLOG = 256 * 1024  # Bytes queued for one slow client before its stream is dropped
+
+# Runs a game script as __main__ through game_hooks, which ends it on F10 and reports its first frame.
+# argv: the directory holding game_hooks.py, then the script.
+GAME_BOOTSTRAP = """
+import sys
+sys.path.append(sys.argv[1])
+import game_hooks
+sys.path.remove(sys.argv[1])
+sys.argv = sys.argv[2:]
+game_hooks.run_game(sys.argv[0])
+"""
+
+# Static file settings
+STATIC_CACHE_DIR = os.path.join(FRONTEND_DIR, ".cache", "static")
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/wasm",
+                      "application/xml", "image/svg+xml")
+MIN_COMPRESS_SIZE = 256  # Bytes; smaller files are not worth compressing
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{8,}\.\w+$")  # e.g. app.3f9a1c2b.js
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MAX_RANGES = 16  # More ranges than this in one request are answered with the whole file
+SMALL_FILE_SIZE = 64 * 1024  # Regions up to this size are written directly instead of with sendfile
+STAT_TTL = 1.0  # Seconds a static file is trusted before its mtime is checked again
+FILE_CACHE_BUDGET = 32 * 1024 * 1024  # Bytes of small files and their gzip variants kept in memory
+
+# Content-addressed store: files named by the sha256 of their content, shared by every game
+CAS_DIR = os.path.join(FRONTEND_DIR, "cas")
+CAS_LINK = re.compile(r'(src|href)="game-assets/([^"/]+)/([^"]+)"')  # game-assets/<game>/<file> on the static pages
+
+# Static export settings
+EXPORT_MANIFEST = "export-manifest.json"
+EXPORT_SKIP = (".cache", "__pycache__", "server.py", "loadtest.py")
+PRERENDERED_ROUTES = ("game_launcher", "play-desktop-game")
+PRERENDERED_LINK = re.compile(r"/(game_launcher|play-desktop-game)\?game=([\w.-]+)")
+
+# Asset bundling settings
+BUNDLE_DIR = os.path.join(FRONTEND_DIR, "bundles")
+BUNDLED_PAGES_DIR = os.path.join(FRONTEND_DIR, ".cache", "pages")
+BUNDLED_PAGES = ("index.html", "about.html", "developer.html")
+LOCAL_STYLESHEET_TAG = re.compile(r'([ \t]*)<link rel="stylesheet" href="(?!https?:|//)([^"]+)">\n?')
+LOCAL_SCRIPT_TAG = re.compile(r'([ \t]*)<script src="(?!https?:|//)([^"]+)"></script>\n?')
+
+# Turn a game directory name into the id used in URLs
+def game_slug(game_dir):
+    return game_dir.lower().replace(" ", "-")
+
+# List the game directories next to the frontend
+def list_game_dirs():
+    return [d for d in os.listdir(GAMES_DIR)
+            if os.path.isdir(os.path.join(GAMES_DIR, d)) and d not in ("FRONTEND", "__pycache__") and not d.startswith(".")]
+
+# Modification time of a file, or None if it does not exist
+def file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+# Records how long each startup phase takes, for --profile-startup
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.phases = [("imports", IMPORT_FINISHED - IMPORT_STARTED)]
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.phases.append((name, time.perf_counter() - start))
+
+    def report(self):
+        """Prints the recorded phases and stops recording"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        print("Startup profile:")
+        for name, seconds in self.phases:
+            print(f"  {name:<28}{seconds * 1000:9.2f} ms")
+        print(f"  {'total since import':<28}{(time.perf_counter() - IMPORT_STARTED) * 1000:9.2f} ms")
+
+PROFILER = StartupProfiler()
+
+# Write a file atomically so the server never serves a half-written file
+def write_file_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+# Write a generated file unless it already has exactly this content
+def update_file(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    write_file_atomic(path, data)
+    return True
+
+# Remembers what each generated file was built from, so unchanged files are not rewritten
+class BuildManifest:
+    def __init__(self, path=BUILD_MANIFEST_PATH):
+        self.path = path
+        self.changed = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.sources = json.load(f)
+        except (OSError, ValueError):
+            self.sources = {}
+
+    def is_current(self, key, source, output_path):
+        """True if output_path exists and was built from the same source"""
+        return self.sources.get(key) == source and os.path.exists(output_path)
+
+    def record(self, key, source):
+        if self.sources.get(key) != source:
+            self.sources[key] = source
+            self.changed = True
+
+    def digest(self, path):
+        """sha256 of a file, hashed again only when its mtime or size changed since it was recorded"""
+        stat = os.stat(path)
+        key = "digest:" + os.path.relpath(path, GAMES_DIR).replace(os.sep, "/")
+        version = [stat.st_mtime_ns, stat.st_size]
+        recorded = self.sources.get(key)
+        if recorded and recorded[:2] == version:
+            return recorded[2]
+        digest = file_digest(path)
+        self.record(key, version + [digest])
+        return digest
+
+    def save(self):
+        if self.changed:
+            write_file_atomic(self.path, json.dumps(self.sources, indent=1, sort_keys=True).encode())
+            self.changed = False
+
+# URL of a file's content in the content-addressed store: cas/<sha256><ext>
+def cas_url(path, digest=None):
+    return f"cas/{digest or file_digest(path)}{os.path.splitext(path)[1].lower()}"
+
+# Add a file's content to the content-addressed store and return its URL.
+# Build outputs are hardlinked since they are only ever replaced, never edited;
+# game sources may be edited in place, so they are copied.
+def cas_store(path, link=False, digest=None):
+    url = cas_url(path, digest)
+    store_path = os.path.join(FRONTEND_DIR, *url.split("/"))
+    if os.path.exists(store_path):
+        return url
     
-    for game_dir in game_dirs:
-        # Clean game name for URL/directory purposes
-        clean_name = game_dir.replace(" ", "-")
-        asset_dir = os.path.join(FRONTEND_DIR, "game-assets", clean_name)
-        
-        # Create the asset directory if it doesn't exist
-        if not os.path.exists(asset_dir):
-            os.makedirs(asset_dir)
-        
-        # Copy app image if it exists
-        source_app_img = None
-        for img_name in ["app.png", "app.gif", "screenshot.png", "preview.png"]:
-            img_path = os.path.join(GAMES_DIR, game_dir, img_name)
-            if os.path.exists(img_path):
-                source_app_img = img_path
-                break
+    os.makedirs(CAS_DIR, exist_ok=True)
+    temp_path = f"{store_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    linked = False
+    if link:
+        try:
+            os.link(path, temp_path)
+            linked = True
+        except OSError:
+            pass  # Different filesystem, or no hardlink support
+    if not linked:
+        shutil.copy2(path, temp_path)
+    os.replace(temp_path, store_path)
+    return url
+
+# Put the thumbnails into the content-addressed store
+def setup_asset_directories(manifest):
+    for entry in CATALOG.games():
+        if not entry.thumbnail:
+            continue
         
-        if source_app_img:
-            # Copy the app image to the asset directory
-            dest_path = os.path.join(asset_dir, os.path.basename(source_app_img))
-            if not os.path.exists(dest_path):
-                shutil.copy2(source_app_img, dest_path)
+        # The URL already names the content, so an existing store file is up to date
+        store_path = os.path.join(FRONTEND_DIR, *entry.thumbnail_url.split("/"))
+        if manifest.is_current(f"thumbnail:{entry.slug}", entry.thumbnail_url, store_path):
+            continue
+        cas_store(entry.thumbnail, digest=entry.thumbnail_digest)
+        manifest.record(f"thumbnail:{entry.slug}", entry.thumbnail_url)
 
     # Create pygbag builds directory if it doesn't exist
     if not os.path.exists(PYGBAG_DIR):
         os.makedirs(PYGBAG_DIR)
 
 # Create a player HTML file for each game
-def create_game_players():
+def create_game_players(manifest):
     template_path = os.path.join(FRONTEND_DIR, "game-players", "template.html")
     
     if not os.path.exists(template_path):
@@ -60,33 +313,17 @@ def create_game_players():
     
     with open(template_path, 'r', encoding='utf-8') as f:
         template = f.read()
+    template_hash = hashlib.sha256(template.encode()).hexdigest()
     
-    game_dirs = [d for d in os.listdir(GAMES_DIR) if os.path.isdir(os.path.join(GAMES_DIR, d)) and d != "FRONTEND" and d != "__pycache__"]
-    
-    for game_dir in game_dirs:
-        # Clean game name for URL/directory purposes
-        clean_name = game_dir.lower().replace(" ", "-")
+    for entry in CATALOG.games():
+        game_dir = entry.name
+        clean_name = entry.slug
         player_path = os.path.join(FRONTEND_DIR, "game-players", f"{clean_name}.html")
         
-        # Read game description if available
-        description = ""
-        readme_path = os.path.join(GAMES_DIR, game_dir, "README.md")
-        if os.path.exists(readme_path):
-            try:
-                with open(readme_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    if lines:
-                        description = lines[0].strip()
-            except Exception as e:
-                print(f"Warning: Could not read README for {game_dir}: {e}")
-        
-        # Create customized player file
-        game_config = {
-            'title': game_dir,
-            'description': description,
-            'gameUrl': f"/game_launcher?game={clean_name}",
-            'homeUrl': "/"
-        }
+        # A player page only depends on the template and the game's name
+        source = f"{template_hash}:{game_dir}"
+        if manifest.is_current(f"player:{clean_name}", source, player_path):
+            continue
         
         # Replace game config in template
         new_content = template.replace(
@@ -95,74 +332,1346 @@ def create_game_players():
         )
         
         # Write the customized player file
-        with open(player_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        update_file(player_path, new_content.encode('utf-8'))
+        manifest.record(f"player:{clean_name}", source)
+
+# Catalog record for one game as used by the frontend scripts
+def game_record(entry):
+    return {
+        'id': entry.slug,
+        'title': entry.name,
+        'description': entry.description or f"Play {entry.name} right in your browser!",
+        'thumbnail': entry.thumbnail_url,
+        'playUrl': f"game-players/{entry.slug}.html",
+        'screenshots': [entry.thumbnail_url] if entry.thumbnail_url else [],
+        'webReady': entry.web_ready
+    }
 
 # Generate the games-data.js file with actual game data
-def generate_games_data():
-    games_data = []
-    game_dirs = [d for d in os.listdir(GAMES_DIR) if os.path.isdir(os.path.join(GAMES_DIR, d)) and d != "FRONTEND" and d != "__pycache__"]
+def generate_games_data(manifest):
+    games_data, _ = CATALOG.records()
     
-    for game_dir in game_dirs:
-        # Skip directories without main.py or game.py
-        main_py = os.path.join(GAMES_DIR, game_dir, "main.py")
-        game_py = os.path.join(GAMES_DIR, game_dir, "game.py")
-        if not (os.path.exists(main_py) or os.path.exists(game_py)):
-            continue
-            
-        # Clean name for URL/directory purposes
-        clean_name = game_dir.lower().replace(" ", "-")
+    content = ("// Game collection data\nconst games = " + json.dumps(games_data, indent=4) + ";").encode('utf-8')
+    data_path = os.path.join(FRONTEND_DIR, "games-data.js")
+    source = hashlib.sha256(content).hexdigest()
+    if manifest.is_current("games-data", source, data_path):
+        return
+    
+    # Write the games data to the games-data.js file
+    update_file(data_path, content)
+    manifest.record("games-data", source)
+
+# Strip comments and redundant whitespace from a stylesheet
+def minify_css(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    return text.replace(";}", "}").strip()
+
+# Drop comment lines, blank lines and indentation from a script.
+# Newlines are kept so automatic semicolon insertion still works, and
+# template literals are left untouched.
+def minify_js(text):
+    lines = []
+    in_template = False
+    for line in text.splitlines():
+        if not in_template:
+            line = line.strip()
+            if not line or line.startswith("//"):
+                continue
+        lines.append(line)
+        if line.count("`") % 2:
+            in_template = not in_template
+    return "\n".join(lines)
+
+# Concatenated, minified stylesheets and scripts with content-hashed names.
+# The pages that load them are rewritten into BUNDLED_PAGES_DIR and served in
+# place of the originals, so the sources in FRONTEND stay untouched.
+class AssetBundler:
+    KINDS = (
+        (LOCAL_STYLESHEET_TAG, "css", "\n", minify_css, '<link rel="stylesheet" href="bundles/{}">'),
+        (LOCAL_SCRIPT_TAG, "js", ";\n", minify_js, '<script src="bundles/{}"></script>'),
+    )
+
+    def __init__(self):
+        self.pages = {}
+
+    def page_for(self, path):
+        """Returns the rewritten version of a bundled page, or path itself"""
+        return self.pages.get(path, path)
+
+    def build(self):
+        """Rebuilds the bundles and rewrites the pages that reference them"""
+        pages = {}
+        bundles = set()
+        for page in BUNDLED_PAGES:
+            source_path = os.path.join(FRONTEND_DIR, page)
+            try:
+                with open(source_path, encoding='utf-8') as f:
+                    html = f.read()
+                for pattern, ext, separator, minify, tag in self.KINDS:
+                    html = self.bundle_tags(html, pattern, ext, separator, minify, tag, bundles)
+                html = CAS_LINK.sub(self.store_link, html)
+            except OSError as e:
+                print(f"Warning: Could not bundle assets for {page}: {e}")
+                continue
+            output_path = os.path.join(BUNDLED_PAGES_DIR, page)
+            update_file(output_path, html.encode('utf-8'))
+            pages[source_path] = output_path
+        self.pages = pages
+        self.remove_stale(bundles)
+
+    @staticmethod
+    def bundle_tags(html, pattern, ext, separator, minify, tag, bundles):
+        """Replaces every local tag of one kind with a single tag for their bundle"""
+        matches = list(pattern.finditer(html))
+        if not matches:
+            return html
+        
+        parts = []
+        for match in matches:
+            with open(os.path.join(FRONTEND_DIR, match.group(2)), encoding='utf-8') as f:
+                parts.append(minify(f.read()))
+        content = (separator.join(parts) + "\n").encode('utf-8')
+        name = f"app.{hashlib.sha256(content).hexdigest()[:12]}.{ext}"
+        update_file(os.path.join(BUNDLE_DIR, name), content)
+        bundles.add(name)
+        
+        # The bundle goes where the first tag was; the other tags are dropped
+        first = matches[0]
+        replacement = first.group(1) + tag.format(name) + "\n"
+        for match in reversed(matches[1:]):
+            html = html[:match.start()] + html[match.end():]
+        return html[:first.start()] + replacement + html[first.end():]
+
+    @staticmethod
+    def store_link(match):
+        """Points an image on a page at its copy in the content-addressed store, read from the game's own directory"""
+        attribute, game_dir, name = match.groups()
+        entry = CATALOG.get(game_slug(game_dir))
+        if entry is None:
+            return match.group(0)
+        if entry.thumbnail and os.path.basename(entry.thumbnail) == name:
+            # Already stored by setup_asset_directories
+            return f'{attribute}="{entry.thumbnail_url}"'
+        path = os.path.join(entry.path, *name.split("/"))
+        if not os.path.isfile(path):
+            return match.group(0)
+        return f'{attribute}="{cas_store(path)}"'
+
+    @staticmethod
+    def remove_stale(bundles):
+        """Deletes bundles that no page references any more"""
+        try:
+            names = os.listdir(BUNDLE_DIR)
+        except OSError:
+            return
+        for name in names:
+            if name not in bundles:
+                try:
+                    os.remove(os.path.join(BUNDLE_DIR, name))
+                except OSError:
+                    pass
+
+BUNDLES = AssetBundler()
+
+# Bring the generated frontend files up to date with the catalog
+def build_frontend():
+    manifest = BuildManifest()
+    with PROFILER.phase("asset directory setup"):
+        setup_asset_directories(manifest)
+    with PROFILER.phase("player page generation"):
+        create_game_players(manifest)
+    with PROFILER.phase("games data generation"):
+        generate_games_data(manifest)
+        manifest.save()
+    with PROFILER.phase("asset bundling"):
+        BUNDLES.build()
+    with PROFILER.phase("precache manifests"):
+        for entry in CATALOG.games():
+            if entry.web_ready:
+                try:
+                    write_precache(os.path.dirname(entry.build_index), entry.slug)
+                except OSError as e:
+                    print(f"Warning: Could not write the precache manifest for {entry.name}: {e}")
+
+# Everything the request handlers need to know about one game directory
+class CatalogEntry:
+    def __init__(self, name, manifest):
+        self.name = name
+        self.slug = game_slug(name)
+        self.path = os.path.join(GAMES_DIR, name)
         
-        # Get description from README
-        description = ""
-        readme_path = os.path.join(GAMES_DIR, game_dir, "README.md")
-        if os.path.exists(readme_path):
+        # First existing preview image and entry point script
+        self.thumbnail = None
+        for img_name in THUMBNAIL_NAMES:
+            img_path = os.path.join(self.path, img_name)
+            if os.path.exists(img_path):
+                self.thumbnail = img_path
+                break
+        
+        # Thumbnails are served from the content-addressed store, see setup_asset_directories
+        self.thumbnail_digest = None
+        self.thumbnail_url = None
+        if self.thumbnail:
+            self.thumbnail_digest = manifest.digest(self.thumbnail)
+            self.thumbnail_url = cas_url(self.thumbnail, self.thumbnail_digest)
+        
+        self.entry_point = None
+        for script_name in ENTRY_POINT_NAMES:
+            script_path = os.path.join(self.path, script_name)
+            if os.path.exists(script_path):
+                self.entry_point = script_path
+                break
+        
+        # Short description is the first README line, the info page shows the first two
+        self.description = ""
+        self.details = ""
+        self.readme_path = os.path.join(self.path, "README.md")
+        if os.path.exists(self.readme_path):
             try:
-                with open(readme_path, 'r', encoding='utf-8') as f:
+                with open(self.readme_path, 'r', encoding='utf-8') as f:
                     lines = f.readlines()
                     if lines:
-                        description = lines[0].strip()
+                        self.description = lines[0].strip()
+                        self.details = self.description
+                        if len(lines) > 1:
+                            self.details += "<br><br>" + lines[1].strip()
             except Exception as e:
-                print(f"Warning: Could not read README for {game_dir}: {e}")
-        
-        # Find thumbnail
-        thumbnail = None
-        for img_name in ["app.png", "app.gif", "screenshot.png", "preview.png"]:
-            img_path = f"game-assets/{clean_name}/{img_name}"
-            full_path = os.path.join(FRONTEND_DIR, img_path)
-            if os.path.exists(full_path):
-                thumbnail = img_path
-                break
+                print(f"Warning: Could not read README for {name}: {e}")
         
-        game_data = {
-            'id': clean_name,
-            'title': game_dir,
-            'description': description or f"Play {game_dir} right in your browser!",
-            'thumbnail': thumbnail,
-            'playUrl': f"game-players/{clean_name}.html",
-            'screenshots': [thumbnail] if thumbnail else [],
-            'webReady': False  # Will be updated after pygbag builds
-        }
+        # A game is playable in the browser once its pygbag build exists
+        self.build_index = os.path.join(PYGBAG_DIR, self.slug, "index.html")
+        self.web_ready = os.path.exists(self.build_index)
+        
+        self.signature = self.current_signature()
+
+    def current_signature(self):
+        """Modification times that decide whether this entry is stale"""
+        return (file_mtime(self.path), file_mtime(self.readme_path),
+                file_mtime(self.thumbnail) if self.thumbnail else None,
+                file_mtime(self.build_index))
+
+# In-memory index of all games, keyed by slug
+class GameCatalog:
+    def __init__(self):
+        self.entries = {}
+        self.version = 0
+        self.games_dir_mtime = None
+        self.names = []
+        self.refresh_lock = threading.Lock()
+        self.listeners = []
+        self.records_cache = (None, [], "")
+
+    def add_listener(self, callback):
+        """Calls callback() after every refresh that changed the catalog"""
+        self.listeners.append(callback)
+
+    def get(self, slug):
+        """Looks up a game by slug without touching the filesystem"""
+        return self.entries.get(slug)
+
+    def games(self):
+        """All catalog entries sorted by directory name"""
+        return sorted(self.entries.values(), key=lambda entry: entry.name)
+
+    def records(self):
+        """Frontend records of the playable games and a hash of them, rebuilt once per catalog version"""
+        version, records, records_hash = self.records_cache
+        if version != self.version:
+            version = self.version
+            # Skip directories without main.py or game.py
+            records = [game_record(entry) for entry in self.games() if entry.entry_point]
+            records_hash = hashlib.sha1(json.dumps(records, sort_keys=True).encode()).hexdigest()[:16]
+            self.records_cache = (version, records, records_hash)
+        return records, records_hash
+
+    def refresh(self):
+        """Reloads entries whose directory, README or thumbnail changed. Returns True if anything changed."""
+        with self.refresh_lock:
+            # Only list GAMES_DIR again when games were added, removed or renamed
+            games_dir_mtime = file_mtime(GAMES_DIR)
+            if games_dir_mtime != self.games_dir_mtime:
+                self.names = list_game_dirs()
+                self.games_dir_mtime = games_dir_mtime
+            
+            entries = {}
+            changed = False
+            manifest = None
+            for name in self.names:
+                entry = self.entries.get(game_slug(name))
+                if entry is None or entry.name != name or entry.current_signature() != entry.signature:
+                    if not os.path.isdir(os.path.join(GAMES_DIR, name)):
+                        changed = True
+                        continue
+                    # Recorded thumbnail digests spare hashing unchanged images again
+                    if manifest is None:
+                        manifest = BuildManifest()
+                    entry = CatalogEntry(name, manifest)
+                    changed = True
+                entries[entry.slug] = entry
+            if manifest is not None:
+                manifest.save()
+            
+            if changed or len(entries) != len(self.entries):
+                # Swap in the new index in one assignment so readers never see a partial update
+                self.entries = entries
+                self.version += 1
+                for callback in self.listeners:
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"Warning: Catalog listener failed: {e}")
+                return True
+            return False
+
+    def watch(self, interval=CATALOG_POLL_INTERVAL):
+        """Refreshes the catalog from a background thread"""
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Warning: Could not refresh game catalog: {e}")
         
-        # Check if the game is web-ready
-        build_dir = os.path.join(PYGBAG_DIR, clean_name)
-        index_file = os.path.join(build_dir, "index.html")
-        game_data['webReady'] = os.path.exists(index_file)
+        thread = threading.Thread(target=poll, name="catalog-watcher", daemon=True)
+        thread.start()
+        return thread
+
+CATALOG = GameCatalog()
+
+# Check an If-None-Match header against an entity tag
+def etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    # Weak comparison is enough for GET revalidation
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
+# Encoded response body with its precomputed headers
+class CachedPage:
+    def __init__(self, html, status=200, content_type='text/html; charset=utf-8', etag=None):
+        self.body = html if isinstance(html, bytes) else html.encode()
+        self.status = status
+        self.content_type = content_type
+        self.content_length = str(len(self.body))
+        self.etag = etag or '"' + hashlib.sha1(self.body).hexdigest() + '"'
+
+# LRU cache of rendered pages keyed by (route, slug)
+class PageCache:
+    # Hits and misses are counted in METRICS, whose per-thread shards need no lock
+    metric_labels = (('cache', 'pages'),)
+
+    def __init__(self, max_pages=PAGE_CACHE_SIZE):
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, version, render):
+        """Returns the page stored under key, rendering it again if it was built for another version"""
+        with self.lock:
+            cached = self.pages.get(key)
+            if cached and cached[0] == version:
+                self.pages.move_to_end(key)
+                METRICS.inc('portal_cache_hits_total', self.metric_labels)
+                return cached[1]
+            METRICS.inc('portal_cache_misses_total', self.metric_labels)
         
-        games_data.append(game_data)
+        page = render()
+        with self.lock:
+            self.pages[key] = (version, page)
+            self.pages.move_to_end(key)
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        return page
+
+PAGE_CACHE = PageCache()
+
+# Check whether an Accept-Encoding header allows gzip
+def accepts_gzip(header):
+    if not header:
+        return False
+    for coding in header.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            # "gzip;q=0" explicitly refuses gzip
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+# Hash a file without loading it into memory at once
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Build the gzip variant of a file once; variants are stored by content hash
+def build_gzip_variant(path, digest):
+    import gzip
+    gzip_path = os.path.join(STATIC_CACHE_DIR, digest + ".gz")
+    if not os.path.exists(gzip_path):
+        os.makedirs(STATIC_CACHE_DIR, exist_ok=True)
+        temp_path = f"{gzip_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(path, 'rb') as src, gzip.GzipFile(temp_path, 'wb', compresslevel=9, mtime=0) as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(temp_path, gzip_path)
+    return gzip_path
+
+# Compresses static files on a background thread, so no request waits for gzip
+class GzipQueue:
+    def __init__(self):
+        self.executor = None
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def submit(self, info):
+        """Builds the gzip variant of a StaticFile and attaches it once it is ready"""
+        with self.lock:
+            future = self.pending.get(info.digest)
+            if future is None:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gzip")
+                future = self.executor.submit(build_gzip_variant, info.path, info.digest)
+                self.pending[info.digest] = future
+                future.add_done_callback(lambda future, digest=info.digest: self.finished(digest))
+        future.add_done_callback(lambda future: info.attach_gzip(future.result()) if not future.exception() else None)
+
+    def finished(self, digest):
+        with self.lock:
+            future = self.pending.pop(digest)
+        if future.exception():
+            print(f"Warning: Could not compress a static file: {future.exception()}")
+
+GZIP_QUEUE = GzipQueue()
+
+# Headers and encodings for one version of a static file
+class StaticFile:
+    def __init__(self, path, stat, content_type, wait_for_gzip=False):
+        self.path = path
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        self.mtime = stat.st_mtime
+        self.size = stat.st_size
+        self.content_type = content_type
+        self.checked = time.monotonic()
+        self.digest = file_digest(path)
+        self.etag = '"' + self.digest[:32] + '"'
+        self.immutable = (bool(FINGERPRINT_PATTERN.search(os.path.basename(path)))
+                          or os.path.dirname(path) == CAS_DIR)
+        
+        # Only keep a gzip variant when it actually saves bytes
+        self.gzip_path = None
+        self.gzip_size = None
+        self.gzip_etag = None
+        if self.size >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            if wait_for_gzip or os.path.exists(os.path.join(STATIC_CACHE_DIR, self.digest + ".gz")):
+                self.attach_gzip(build_gzip_variant(path, self.digest))
+            else:
+                # Served uncompressed until the variant has been built
+                GZIP_QUEUE.submit(self)
+
+    def attach_gzip(self, gzip_path):
+        gzip_size = os.path.getsize(gzip_path)
+        if gzip_size < self.size:
+            self.gzip_size = gzip_size
+            self.gzip_etag = '"' + self.digest[:32] + '-gz"'
+            # Requests check gzip_path, so it is set last
+            self.gzip_path = gzip_path
+
+    @property
+    def cache_control(self):
+        # Fingerprinted names change with their content, everything else is revalidated
+        return IMMUTABLE_CACHE_CONTROL if self.immutable else "no-cache"
+
+# Index of static files, refreshed when a file's mtime or size changes
+class StaticFileIndex:
+    metric_labels = (('cache', 'static'),)
+
+    def __init__(self):
+        self.files = {}
+        self.lock = threading.Lock()
+
+    def recent(self, path):
+        """Returns the StaticFile served for path if it was checked within STAT_TTL, without touching the disk"""
+        info = self.files.get(path)
+        if info and time.monotonic() - info.checked < STAT_TTL:
+            METRICS.inc('portal_cache_hits_total', self.metric_labels)
+            return info
+        return None
+
+    def lookup(self, path, content_type, alias=None):
+        """Returns the StaticFile for path, or None if it is not a regular file.
+        alias is the request path that resolved to path, e.g. a directory for its index page."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        
+        info = self.files.get(path)
+        if info and info.version == (stat.st_mtime_ns, stat.st_size):
+            METRICS.inc('portal_cache_hits_total', self.metric_labels)
+            info.checked = time.monotonic()
+        else:
+            # Hash and compress outside the lock; a racing request just does the same work
+            METRICS.inc('portal_cache_misses_total', self.metric_labels)
+            info = StaticFile(path, stat, content_type)
+        with self.lock:
+            self.files[path] = info
+            if alias is not None:
+                self.files[alias] = info
+        return info
+
+STATIC_FILES = StaticFileIndex()
+
+# LRU cache of small static file bodies, bounded by the total number of bytes held.
+# Entries are keyed by path and encoding and dropped when the file's version changes.
+class FileCache:
+    metric_labels = (('cache', 'files'),)
+
+    def __init__(self, budget=FILE_CACHE_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, info, use_gzip):
+        """Returns the body of a static file from memory, or None if it is too large to keep"""
+        size = info.gzip_size if use_gzip else info.size
+        if size > min(SMALL_FILE_SIZE, self.budget):
+            return None
+        
+        key = (info.path, use_gzip)
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached and cached[0] == info.version:
+                self.entries.move_to_end(key)
+                METRICS.inc('portal_cache_hits_total', self.metric_labels)
+                return cached[1]
+            METRICS.inc('portal_cache_misses_total', self.metric_labels)
+        
+        try:
+            with open(info.gzip_path if use_gzip else info.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old:
+                self.used -= len(old[1])
+            self.entries[key] = (info.version, data)
+            self.used += len(data)
+            while self.used > self.budget:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.used -= len(evicted)
+        return data
+
+FILE_CACHE = FileCache()
+
+# Parse a Range header into (start, end) pairs with inclusive ends.
+# Returns None if the header should be ignored and [] if no range can be satisfied.
+def parse_byte_ranges(header, size):
+    units, _, spec = header.partition("=")
+    if units.strip().lower() != "bytes" or not spec.strip():
+        return None
     
-    # Write the games data to the games-data.js file
-    with open(os.path.join(FRONTEND_DIR, "games-data.js"), 'w', encoding='utf-8') as f:
-        f.write("// Game collection data\nconst games = ")
-        f.write(json.dumps(games_data, indent=4))
-        f.write(";")
+    ranges = []
+    for part in spec.split(","):
+        first, dash, last = part.strip().partition("-")
+        if not dash:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and end < start:
+                    return None
+            else:
+                # "-500" means the last 500 bytes
+                suffix = int(last)
+                start = max(size - suffix, 0)
+                end = size - 1
+        except ValueError:
+            return None
+        if start < size and end >= start:
+            ranges.append((start, min(end, size - 1)))
+    return ranges
+
+# Files that go into a game's web build as (path, relative name), in a stable order
+def game_source_files(game_path):
+    for root, dirs, files in os.walk(game_path):
+        dirs[:] = sorted(d for d in dirs if d not in BUILD_SKIP_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if name.startswith("_wrapper_") or name.endswith(".pyc"):
+                continue
+            path = os.path.join(root, name)
+            yield path, os.path.relpath(path, game_path).replace(os.sep, "/")
+
+# Hash of everything that goes into a game's web build: file names and contents
+def game_source_hash(game_path):
+    digest = hashlib.sha256()
+    for path, relative in game_source_files(game_path):
+        digest.update(relative.encode() + b"\0")
+        digest.update(file_digest(path).encode())
+    return digest.hexdigest()
+
+# Cheap stand-in for game_source_hash that only stats the same files: it changes when a file
+# is added, removed, renamed or rewritten anywhere in the game, without reading any contents
+def game_source_signature(game_path):
+    names = hashlib.sha1()
+    count = size = newest = 0
+    for path, relative in game_source_files(game_path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        names.update(relative.encode() + b"\0")
+        count += 1
+        size += stat.st_size
+        newest = max(newest, stat.st_mtime_ns)
+    return (count, size, newest, names.hexdigest())
+
+# Build one game with pygbag and install it into PYGBAG_DIR/<slug>. Runs in a worker process.
+# Returns True if a new build was installed and False if the existing one was current.
+def build_web_game(game_path, slug):
+    import subprocess
+    output_dir = os.path.join(PYGBAG_DIR, slug)
+    hash_path = os.path.join(output_dir, BUILD_HASH_FILE)
+    source_hash = game_source_hash(game_path)
+    try:
+        with open(hash_path, 'r') as f:
+            if f.read().strip() == source_hash and os.path.exists(os.path.join(output_dir, "index.html")):
+                return False
+    except OSError:
+        pass
+    
+    result = subprocess.run([sys.executable, "-m", "pygbag", "--build", game_path],
+                            capture_output=True, text=True, timeout=BUILD_TIMEOUT)
+    build_dir = os.path.join(game_path, "build", "web")
+    if result.returncode != 0 or not os.path.exists(os.path.join(build_dir, "index.html")):
+        raise RuntimeError((result.stderr or result.stdout).strip()[-2000:] or "pygbag produced no index.html")
+    
+    # Copy next to the target, then swap it in with renames
+    temp_dir = f"{output_dir}.{os.getpid()}.tmp"
+    old_dir = f"{output_dir}.{os.getpid()}.old"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    shutil.copytree(build_dir, temp_dir)
+    link_build_assets(temp_dir)
+    with open(os.path.join(temp_dir, BUILD_HASH_FILE), 'w') as f:
+        f.write(source_hash)
+    if os.path.exists(output_dir):
+        os.replace(output_dir, old_dir)
+    os.replace(temp_dir, output_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return True
+
+# Share a pygbag build's files through the content-addressed store: identical files
+# (the favicon every build gets) are stored once on disk and downloaded once by browsers
+def link_build_assets(build_dir):
+    index_path = os.path.join(build_dir, "index.html")
+    with open(index_path, encoding='utf-8') as f:
+        html = f.read()
+    
+    for name in sorted(os.listdir(build_dir)):
+        path = os.path.join(build_dir, name)
+        if name == "index.html" or not os.path.isfile(path):
+            continue
+        url = cas_store(path, link=True)
+        
+        # Replace the build's own copy with a link to the stored one
+        store_path = os.path.join(FRONTEND_DIR, *url.split("/"))
+        if not os.path.samefile(path, store_path):
+            try:
+                os.link(store_path, f"{path}.tmp")
+                os.replace(f"{path}.tmp", path)
+            except OSError:
+                pass
+        html = html.replace(f'href="{name}"', f'href="/{url}"').replace(f'apk = "{name}"', f'apk = "/{url}"')
+    
+    update_file(index_path, html.encode('utf-8'))
+
+# Write the precache manifest and service worker of one pygbag build.
+# The cache name only changes with the build, so an unchanged build is never downloaded twice.
+def write_precache(build_dir, slug):
+    out_dir = os.path.join(PRECACHE_DIR, slug)
+    with open(os.path.join(build_dir, "index.html"), encoding='utf-8') as f:
+        html = f.read()
+    if SERVICE_WORKER_REGISTRATION not in html and "</body>" in html:
+        html = html.replace("</body>", SERVICE_WORKER_REGISTRATION + "</body>", 1)
+    page_path = os.path.join(out_dir, "index.html")
+    update_file(page_path, html.encode('utf-8'))
+    
+    # The page as served, the build's other files, and the shared files its page loads from the store
+    files = {"./": file_digest(page_path)}
+    for name in sorted(os.listdir(build_dir)):
+        path = os.path.join(build_dir, name)
+        if name.startswith(".") or name in PRECACHE_FILES or not os.path.isfile(path):
+            continue
+        files[name] = file_digest(path)
+    for url in sorted(set(CAS_REFERENCE.findall(html))):
+        # Store names are their content hash
+        files["/" + url] = os.path.splitext(os.path.basename(url))[0]
+    
+    try:
+        with open(os.path.join(build_dir, BUILD_HASH_FILE), 'r') as f:
+            version = f.read().strip()
+    except OSError:
+        # Builds made without the queue have no hash file; their content stands in for it
+        version = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()
+    
+    cache_prefix = f"pygbag-{slug}-"
+    cache_name = cache_prefix + version[:16]
+    manifest = {'cacheName': cache_name, 'buildHash': version,
+                'files': [{'url': url, 'sha256': digest} for url, digest in files.items()]}
+    update_file(os.path.join(out_dir, PRECACHE_MANIFEST), json.dumps(manifest, indent=2).encode('utf-8'))
+    update_file(os.path.join(out_dir, SERVICE_WORKER), (SERVICE_WORKER_TEMPLATE % {
+        'cache_name': json.dumps(cache_name),
+        'cache_prefix': json.dumps(cache_prefix),
+        'urls': json.dumps(list(files)),
+    }).encode('utf-8'))
+
+# The generated file served in place of path, if path is one of a build's precache files
+def precache_path(path):
+    build_dir, name = os.path.split(path)
+    if name not in PRECACHE_FILES or os.path.dirname(build_dir) != PYGBAG_DIR:
+        return path
+    generated = os.path.join(PRECACHE_DIR, os.path.basename(build_dir), name)
+    # A removed build takes its service worker with it
+    if os.path.isfile(generated) and os.path.isfile(os.path.join(build_dir, "index.html")):
+        return generated
+    return path
+
+# Precache files of every build as (path relative to FRONTEND_DIR, generated file)
+def precache_files():
+    for entry in CATALOG.games():
+        if not entry.web_ready:
+            continue
+        build_dir = os.path.dirname(entry.build_index)
+        for name in PRECACHE_FILES:
+            generated = precache_path(os.path.join(build_dir, name))
+            if generated.startswith(PRECACHE_DIR):
+                yield os.path.relpath(os.path.join(build_dir, name), FRONTEND_DIR).replace(os.sep, "/"), generated
+
+# Builds missing or stale pygbag bundles in a process pool, off the request path
+class WebBuildQueue:
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        self.pending = {}
+        self.submitted = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        import importlib.util
+        return importlib.util.find_spec("pygbag") is not None
+
+    def submit_changed(self):
+        """Queues a build for every game whose sources changed since it was last queued"""
+        for entry in CATALOG.games():
+            # pygbag packages a directory around its main.py
+            if not entry.entry_point or os.path.basename(entry.entry_point) != "main.py":
+                continue
+            # The catalog signature misses edits below the top level, so the sources get their own;
+            # the worker's content hash still skips builds for changes that do not alter any file
+            signature = game_source_signature(entry.path)
+            with self.lock:
+                if self.submitted.get(entry.slug) == signature or entry.slug in self.pending:
+                    continue
+                if self.executor is None:
+                    from concurrent.futures import ProcessPoolExecutor
+                    self.executor = ProcessPoolExecutor(max_workers=self.workers)
+                self.submitted[entry.slug] = signature
+                future = self.executor.submit(build_web_game, entry.path, entry.slug)
+                self.pending[entry.slug] = future
+            future.add_done_callback(lambda future, entry=entry: self.finished(entry, future))
+
+    def finished(self, entry, future):
+        with self.lock:
+            self.pending.pop(entry.slug, None)
+        try:
+            installed = future.result()
+        except Exception as e:
+            print(f"Warning: Web build of {entry.name} failed: {e}")
+            return
+        if installed:
+            print(f"Web build of {entry.name} is ready")
+            # The new index.html changes the entry's signature; the refresh swaps in webReady
+            CATALOG.refresh()
+
+    def watch(self, interval=CATALOG_POLL_INTERVAL):
+        """Checks the game sources for edits from a background thread"""
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.submit_changed()
+                except Exception as e:
+                    print(f"Warning: Could not check games for web builds: {e}")
+        
+        thread = threading.Thread(target=poll, name="build-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+BUILD_QUEUE = WebBuildQueue()
+
+# Route label used in metrics; everything that is not a portal route is a static file
+def route_label(path):
+    path = path.split("?", 1)[0]
+    for route in ROUTES:
+        if path == route or path.startswith(route + "/"):
+            return route
+    return "static"
+
+# Format metric labels in the Prometheus text format
+def format_labels(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+# Counters and histograms kept in one shard per thread, so recording never takes a lock.
+# Shards are only merged when /metrics is scraped.
+class Metrics:
+    def __init__(self):
+        self.local = threading.local()
+        self.shards = []
+        self.shards_lock = threading.Lock()
+
+    def shard(self):
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = ({}, {})
+            with self.shards_lock:
+                self.shards.append(shard)
+            self.local.shard = shard
+        return shard
+
+    def inc(self, name, labels=(), amount=1):
+        counters = self.shard()[0]
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        histograms = self.shard()[1]
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            # One count per bucket plus +Inf, then sum and count
+            histogram = histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0, 0]
+        histogram[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        histogram[-2] += value
+        histogram[-1] += 1
+
+    def snapshot(self):
+        """Merged counters and histograms of all threads"""
+        counters = {}
+        histograms = {}
+        with self.shards_lock:
+            shards = list(self.shards)
+        for shard_counters, shard_histograms in shards:
+            # dict.copy() is atomic, so a thread recording at the same time cannot break iteration
+            for key, value in shard_counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, histogram in shard_histograms.copy().items():
+                merged = histograms.setdefault(key, [0] * len(histogram))
+                for i, value in enumerate(list(histogram)):
+                    merged[i] += value
+        return counters, histograms
+
+    def render(self, gauges=()):
+        """Prometheus text exposition of all metrics plus (name, labels, value, type) extras"""
+        counters, histograms = self.snapshot()
+        lines = []
+        typed = set()
+        
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+        
+        for (name, labels), value in sorted(counters.items()):
+            declare(name, "gauge" if name.endswith("_in_flight") else "counter")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        
+        for (name, labels), histogram in sorted(histograms.items()):
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram):
+                cumulative += count
+                lines.append(f"{name}_bucket{format_labels(labels, (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram[-2]:.6f}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram[-1]}")
+        
+        for name, labels, value, kind in sorted(gauges, key=lambda gauge: gauge[0]):
+            declare(name, kind)
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()
+
+# JSON-lines access log written by a background thread. Request threads only
+# put a record on a bounded queue; when the writer falls behind, records are
+# dropped and counted instead of slowing requests down.
+class AccessLog:
+    def __init__(self):
+        self.path = None
+        self.queue = None
+        self.thread = None
+        self.written = 0
+
+    @property
+    def enabled(self):
+        return self.queue is not None
+
+    def open(self, path):
+        import queue
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.queue = queue.Queue(maxsize=ACCESS_LOG_QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.run, name="access-log", daemon=True)
+        self.thread.start()
+        # Report the counter as zero until a record is dropped
+        METRICS.inc('portal_access_log_dropped_total', amount=0)
+
+    def write(self, record):
+        """Queues one record without blocking"""
+        import queue
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            METRICS.inc('portal_access_log_dropped_total')
+
+    def close(self):
+        """Writes out the queued records and stops the writer"""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+        self.thread = None
+
+    def run(self):
+        f = open(self.path, 'a', encoding='utf-8')
+        try:
+            while True:
+                # Block for the first record, then take whatever else is already waiting
+                batch = [self.queue.get()]
+                while len(batch) < ACCESS_LOG_BATCH and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                stop = None in batch
+                lines = [json.dumps(record, separators=(',', ':')) + "\n" for record in batch if record is not None]
+                if lines:
+                    f.write("".join(lines))
+                    f.flush()
+                    self.written += len(lines)
+                if stop:
+                    return
+                if f.tell() >= ACCESS_LOG_MAX_BYTES:
+                    f.close()
+                    self.rotate()
+                    f = open(self.path, 'a', encoding='utf-8')
+        except OSError as e:
+            print(f"Warning: Access log disabled: {e}")
+        finally:
+            f.close()
+
+    def rotate(self):
+        """Shifts access.log to access.log.1, access.log.1 to access.log.2, and so on"""
+        for index in range(ACCESS_LOG_BACKUPS - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+ACCESS_LOG = AccessLog()
+
+# Resident memory of a process in bytes, read from /proc where available
+def process_rss(pid):
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+# Raised when a launch would exceed the number of games allowed to run at once
+class LaunchLimitError(Exception):
+    pass
+
+# One game process started from the web portal
+class Launch:
+    def __init__(self, launch_id, entry, process):
+        self.id = launch_id
+        self.slug = entry.slug
+        self.name = entry.name
+        self.process = process
+        self.pid = process.pid
+        self.started_at = time.time()
+        self.started = time.monotonic()
+        self.ended = None
+        self.exit_code = None
+        self.spawn_time = None
+        self.first_frame_time = None
+        # (id, event, data) tuples published so far; guarded by the event hub's lock
+        self.events = []
+        self.events_complete = False
+
+    @property
+    def running(self):
+        return self.exit_code is None
+
+    def status(self):
+        """Snapshot of this launch for /api/launches"""
+        end = self.ended if self.ended is not None else time.monotonic()
+        return {
+            'id': self.id,
+            'game': self.slug,
+            'title': self.name,
+            'pid': self.pid,
+            'running': self.running,
+            'started': self.started_at,
+            'uptime': round(end - self.started, 3),
+            'rss': process_rss(self.pid) if self.running else None,
+            'exitCode': self.exit_code,
+            'spawnTime': self.spawn_time,
+            'firstFrameTime': self.first_frame_time
+        }
+
+# Format one server-sent event
+def format_event(event_id, event, data):
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+# One client connection receiving the events of a launch
+class EventStream:
+    def __init__(self, sock, launch_id):
+        self.sock = sock
+        self.launch_id = launch_id
+        self.pending = bytearray()
+        self.closing = False
+        self.registered_events = 0
+
+# Delivers launch events to server-sent event streams from a single selector thread.
+# Request handlers hand their socket over after sending the headers, so an idle
+# stream does not hold on to a worker thread.
+class EventHub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.streams = {}
+        self.selector = None
+        self.wakeup_recv = None
+        self.wakeup_send = None
+
+    def start(self):
+        """Starts the selector thread the first time a stream is opened"""
+        if self.selector is not None:
+            return
+        self.selector = selectors.DefaultSelector()
+        self.wakeup_recv, self.wakeup_send = socket.socketpair()
+        self.wakeup_recv.setblocking(False)
+        self.wakeup_send.setblocking(False)
+        self.selector.register(self.wakeup_recv, selectors.EVENT_READ)
+        threading.Thread(target=self.run, name="event-hub", daemon=True).start()
+
+    def wake(self):
+        if self.wakeup_send is not None:
+            try:
+                self.wakeup_send.send(b"\0")
+            except OSError:
+                pass  # The hub is already awake with a full wakeup buffer
+
+    def publish(self, launch, event, data, final=False):
+        """Records an event for a launch and queues it for every open stream.
+        final marks the last event; streams close once it has been sent."""
+        with self.lock:
+            event_id = len(launch.events) + 1
+            launch.events.append((event_id, event, data))
+            launch.events_complete = launch.events_complete or final
+            message = format_event(event_id, event, data)
+            for stream in self.streams.get(launch.id, ()):
+                stream.pending += message
+                stream.closing = stream.closing or final
+        self.wake()
+
+    def backlog(self, launch, last_event_id):
+        """Events of a launch a client has not seen yet, and whether more can follow"""
+        with self.lock:
+            return [event for event in launch.events if event[0] > last_event_id], not launch.events_complete
+
+    def subscribe(self, sock, launch, last_event_id=0):
+        """Takes over a connection whose event-stream headers were sent and replays missed events"""
+        sock.setblocking(False)
+        stream = EventStream(sock, launch.id)
+        stream.pending += f"retry: {EVENT_RETRY_MS}\n\n".encode()
+        with self.lock:
+            self.start()
+            for event_id, event, data in launch.events:
+                if event_id > last_event_id:
+                    stream.pending += format_event(event_id, event, data)
+            stream.closing = launch.events_complete
+            self.streams.setdefault(launch.id, set()).add(stream)
+        self.wake()
+
+    def open_streams(self):
+        with self.lock:
+            return sum(len(streams) for streams in self.streams.values())
+
+    def run(self):
+        next_heartbeat = time.monotonic() + EVENT_HEARTBEAT_INTERVAL
+        while True:
+            for key, mask in self.selector.select(max(0, next_heartbeat - time.monotonic())):
+                if key.fileobj is self.wakeup_recv:
+                    try:
+                        while self.wakeup_recv.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+                if mask & selectors.EVENT_READ:
+                    # Clients never send anything after the request, so this is a disconnect
+                    self.read_or_close(key.data)
+            
+            with self.lock:
+                if time.monotonic() >= next_heartbeat:
+                    next_heartbeat = time.monotonic() + EVENT_HEARTBEAT_INTERVAL
+                    for streams in self.streams.values():
+                        for stream in streams:
+                            stream.pending += b": heartbeat\n\n"
+                for streams in list(self.streams.values()):
+                    for stream in list(streams):
+                        self.flush(stream)
+
+    def read_or_close(self, stream):
+        try:
+            data = stream.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            with self.lock:
+                self.close(stream)
+
+    def flush(self, stream):
+        """Sends as much of a stream's backlog as the socket takes; called with the lock held"""
+        if stream.sock is None:
+            return
+        if stream.pending:
+            try:
+                sent = stream.sock.send(stream.pending)
+                del stream.pending[:sent]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self.close(stream)
+                return
+        if stream.closing and not stream.pending:
+            self.close(stream)
+            return
+        if len(stream.pending) > MAX_EVENT_BACKLOG:
+            self.close(stream)
+            return
+        
+        # Only watch for writability while something is waiting to be sent
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if stream.pending else 0)
+        if events != stream.registered_events:
+            if stream.registered_events:
+                self.selector.modify(stream.sock, events, stream)
+            else:
+                self.selector.register(stream.sock, events, stream)
+            stream.registered_events = events
+
+    def close(self, stream):
+        """Closes a stream; called with the lock held"""
+        if stream.sock is None:
+            return
+        if stream.registered_events:
+            self.selector.unregister(stream.sock)
+        stream.sock.close()
+        stream.sock = None
+        streams = self.streams.get(stream.launch_id)
+        if streams is not None:
+            streams.discard(stream)
+            if not streams:
+                del self.streams[stream.launch_id]
+
+EVENT_HUB = EventHub()
+
+# Starts game processes for the portal with a concurrency limit, deduplication and reaping
+class LaunchSupervisor:
+    def __init__(self, max_running=MAX_RUNNING_GAMES, mode="direct"):
+        self.max_running = max_running
+        self.mode = mode
+        self.launches = OrderedDict()
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def running(self):
+        return [launch for launch in self.launches.values() if launch.running]
+
+    def get(self, launch_id):
+        with self.lock:
+            return self.launches.get(launch_id)
+
+    def launch(self, entry):
+        """Starts a game, or returns its current launch if it is already running.
+        Returns (launch, started) and raises LaunchLimitError when too many games run."""
+        with self.lock:
+            running = self.running()
+            for launch in running:
+                if launch.slug == entry.slug:
+                    return launch, False
+            if len(running) >= self.max_running:
+                raise LaunchLimitError(f"{len(running)} games are already running. Close one and try again.")
+            
+            spawn_start = time.monotonic()
+            process, frame_fd = self.spawn(entry)
+            launch = Launch(self.next_id, entry, process)
+            launch.spawn_time = round(time.monotonic() - spawn_start, 4)
+            self.next_id += 1
+            self.launches[launch.id] = launch
+            self.forget_finished()
+        EVENT_HUB.publish(launch, 'spawn', {'game': launch.slug, 'title': launch.name, 'pid': launch.pid,
+                                            'spawnTime': launch.spawn_time})
+        
+        # Wait for the process in the background so it never lingers as a zombie
+        threading.Thread(target=self.reap, args=(launch, frame_fd, spawn_start),
+                         name=f"reaper-{launch.id}", daemon=True).start()
+        return launch, True
+
+    def spawn(self, entry):
+        """Starts the game process. Returns it with the read end of its first-frame pipe, if any."""
+        import subprocess
+        from game_hooks import spawn_with_frame_pipe
+        if self.mode == "launcher":
+            # Run the game launcher with the specific game
+            return subprocess.Popen([sys.executable, os.path.join(GAMES_DIR, "game_launcher.py"), "--launch", entry.name]), None
+        
+        if not entry.entry_point:
+            raise FileNotFoundError(f"{entry.name} has no main.py or game.py")
+        
+        # One interpreter runs the game in its own directory, as if started from there
+        command = [sys.executable, "-c", GAME_BOOTSTRAP, GAMES_DIR, os.path.basename(entry.entry_point)]
+        return spawn_with_frame_pipe(command, cwd=entry.path)
+
+    def reap(self, launch, frame_fd, spawn_start):
+        from game_hooks import wait_for_first_frame
+        if frame_fd is not None and wait_for_first_frame(frame_fd):
+            launch.first_frame_time = round(time.monotonic() - spawn_start, 4)
+            print(f"{launch.name} showed its first frame {launch.first_frame_time * 1000:.0f} ms after launch")
+            EVENT_HUB.publish(launch, 'first-frame', {'firstFrameTime': launch.first_frame_time})
+        
+        exit_code = launch.process.wait()
+        with self.lock:
+            launch.ended = time.monotonic()
+            launch.exit_code = exit_code
+        if exit_code != 0:
+            EVENT_HUB.publish(launch, 'error', {'message': f"{launch.name} exited with code {exit_code}"})
+        EVENT_HUB.publish(launch, 'exit', {'exitCode': exit_code, 'uptime': round(launch.ended - launch.started, 3)},
+                          final=True)
+
+    def forget_finished(self):
+        """Drops the oldest finished launches beyond LAUNCH_HISTORY_SIZE"""
+        finished = [launch_id for launch_id, launch in self.launches.items() if not launch.running]
+        for launch_id in finished[:max(0, len(finished) - LAUNCH_HISTORY_SIZE)]:
+            del self.launches[launch_id]
+
+    def status(self):
+        with self.lock:
+            launches = list(self.launches.values())
+        return {
+            'launches': [launch.status() for launch in launches],
+            'running': sum(1 for launch in launches if launch.running),
+            'maxRunning': self.max_running
+        }
+
+SUPERVISOR = LaunchSupervisor()
 
 # Custom request handler that serves the frontend and launches games
 class GameHandler(http.server.SimpleHTTPRequestHandler):
+    # Keep connections open between requests; idle sockets time out after IDLE_TIMEOUT
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_TIMEOUT
+    # Buffer writes so headers and a cached page body leave in a single send
+    wbufsize = 64 * 1024
+
     def __init__(self, *args, **kwargs):
         # Set the directory to the frontend directory
         super().__init__(*args, directory=FRONTEND_DIR, **kwargs)
 
+    def setup(self):
+        super().setup()
+        METRICS.inc('portal_connections_in_flight')
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            METRICS.inc('portal_connections_in_flight', amount=-1)
+
+    def handle(self):
+        """Serves requests until the connection closes, telling the server while it waits for the next one"""
+        idle = getattr(self.server, 'connection_idle', None)
+        self.close_connection = False
+        while not self.close_connection:
+            if idle is not None:
+                # Waiting here holds a worker, so the server may close the connection when it runs out
+                with idle(self.connection):
+                    try:
+                        next_request = self.rfile.peek(1)
+                    except OSError:
+                        next_request = b""
+                if not next_request:
+                    return
+            self.handle_one_request()
+
+    def handle_one_request(self):
+        # Time from the request line being read until the response is flushed
+        self.request_started = None
+        self.response_status = None
+        self.bytes_sent = 0
+        self.cache_outcome = None
+        super().handle_one_request()
+        if self.request_started is not None:
+            route = route_label(self.path)
+            duration = time.perf_counter() - self.request_started
+            METRICS.observe('portal_request_duration_seconds', (('route', route),), duration)
+            METRICS.inc('portal_requests_total', (('route', route), ('status', str(self.response_status))))
+            METRICS.inc('portal_response_bytes_total', (('route', route),), self.bytes_sent)
+            if ACCESS_LOG.enabled:
+                ACCESS_LOG.write({
+                    'time': round(time.time(), 3),
+                    'client': self.client_address[0],
+                    'method': self.command,
+                    'path': self.path,
+                    'route': route,
+                    'status': self.response_status,
+                    'bytes': self.bytes_sent,
+                    'duration_ms': round(duration * 1000, 3),
+                    'cache': self.cache_outcome
+                })
+
+    def log_request(self, code='-', size='-'):
+        # With an access log the record is written once the response is complete
+        if not ACCESS_LOG.enabled:
+            super().log_request(code, size)
+
+    def parse_request(self):
+        self.request_started = time.perf_counter()
+        return super().parse_request()
+
+    def send_response_only(self, code, message=None):
+        self.response_status = code
+        super().send_response_only(code, message)
+
     def end_headers(self):
         # Add CORS headers to all responses for proper functioning of WebAssembly
         self.send_header('Cross-Origin-Opener-Policy', 'same-origin')
@@ -179,8 +1688,50 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
+    def send_body(self, body, content_type, status=200, cache_control=None):
+        """Sends a complete response body with a Content-Length so the connection can be kept alive"""
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if cache_control:
+            self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+        self.bytes_sent += len(body)
+
+    def send_html(self, html, status=200):
+        """Sends an HTML document"""
+        self.send_body(html.encode(), 'text/html', status)
+
+    def cached_page(self, key, version, render):
+        """PAGE_CACHE.get that also records whether the page had to be rendered"""
+        def render_miss():
+            self.cache_outcome = 'miss'
+            return render()
+        self.cache_outcome = 'hit'
+        return PAGE_CACHE.get(key, version, render_miss)
+
+    def send_page(self, page):
+        """Sends a cached page, or 304 Not Modified if the client already has this version"""
+        if page.status == 200 and etag_matches(self.headers.get('If-None-Match'), page.etag):
+            self.send_response(304)
+            self.send_header('ETag', page.etag)
+            self.end_headers()
+            return
+        
+        self.send_response(page.status)
+        self.send_header('Content-type', page.content_type)
+        self.send_header('Content-Length', page.content_length)
+        if page.status == 200:
+            self.send_header('ETag', page.etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(page.body)
+        self.bytes_sent += len(page.body)
+
     def do_GET(self):
         # Handle OPTIONS requests for CORS preflight
         if self.command == 'OPTIONS':
@@ -188,6 +1739,7 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
             self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Content-Length', '0')
             self.end_headers()
             return
 
@@ -198,24 +1750,19 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
             
             if 'game' in query:
                 game_name = query['game'][0]
+                entry = CATALOG.get(game_name)
                 
-                # Find the actual game directory
-                actual_game_dir = None
-                for d in os.listdir(GAMES_DIR):
-                    if d.lower().replace(" ", "-") == game_name and os.path.isdir(os.path.join(GAMES_DIR, d)):
-                        actual_game_dir = d
-                        break
-                
-                if actual_game_dir:
-                    # Launch the game directly 
+                if entry:
+                    # Launch the game directly, or reuse the launch if it is already running
                     try:
-                        # Run the game launcher with the specific game
-                        subprocess.Popen([sys.executable, os.path.join(GAMES_DIR, "game_launcher.py"), "--launch", actual_game_dir])
-                        self.send_response(200)
-                        self.send_header('Content-type', 'text/html')
-                        self.end_headers()
-                        self.wfile.write(f"<html><body><script>window.location.href='/game-launched?game={game_name}';</script></body></html>".encode())
+                        launch, started = SUPERVISOR.launch(entry)
+                        METRICS.inc('portal_launches_total', (('result', 'started' if started else 'coalesced'),))
+                        self.send_html(f"<html><body><script>window.location.href='/game-launched?game={game_name}&launch={launch.id}';</script></body></html>")
+                    except LaunchLimitError as e:
+                        METRICS.inc('portal_launches_total', (('result', 'rejected'),))
+                        self.serve_error_page(str(e), 503)
                     except Exception as e:
+                        METRICS.inc('portal_launches_total', (('result', 'failed'),))
                         self.serve_error_page(f"Error launching game: {e}")
                     return
                 else:
@@ -228,85 +1775,55 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
             query = parse_qs(urlparse(self.path).query)
             
             if 'game' in query:
-                game_name = query['game'][0]
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.end_headers()
-                
-                html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>Game Launched</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background-color: #2c3e50;
-            color: white;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            height: 100vh;
-            margin: 0;
-            padding: 20px;
-            text-align: center;
-        }}
-        .container {{
-            background-color: rgba(0,0,0,0.3);
-            padding: 30px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            max-width: 600px;
-        }}
-        h1 {{
-            color: #2ecc71;
-        }}
-        p {{
-            font-size: 1.2rem;
-            line-height: 1.6;
-            margin: 20px 0;
-        }}
-        .reminder {{
-            background-color: rgba(52, 152, 219, 0.2);
-            border-left: 4px solid #3498db;
-            padding: 10px 15px;
-            margin: 20px 0;
-            text-align: left;
-            border-radius: 0 5px 5px 0;
-        }}
-        button {{
-            background-color: #3498db;
-            color: white;
-            border: none;
-            padding: 12px 25px;
-            font-size: 1.1rem;
-            border-radius: 8px;
-            cursor: pointer;
-            margin-top: 20px;
-        }}
-        .keyboard {{
-            display: inline-block;
-            background-color: #34495e;
-            padding: 3px 8px;
-            border-radius: 4px;
-            font-family: Consolas, monospace;
-            margin: 0 2px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Game Launched!</h1>
-        <p>The game is now running in a separate window.</p>
-        <div class="reminder">
-            <p><strong>Remember:</strong> Press <span class="keyboard">F10</span> to return to the game launcher when you're done playing.</p>
-        </div>
-        <button onclick="window.location.href='/'">Return to Game Collection</button>
-    </div>
-</body>
-</html>"""
-                self.wfile.write(html.encode())
+                self.send_page(self.cached_page(('game-launched', None), None, self.render_game_launched_page))
                 return
 
+        # Handle the launch event streams
+        match = LAUNCH_EVENTS_PATTERN.match(self.path)
+        if match:
+            self.serve_launch_events(int(match.group(1)))
+            return
+
+        # Handle the launch status API
+        if self.path == '/api/launches':
+            body = json.dumps(SUPERVISOR.status(), separators=(',', ':')).encode()
+            self.send_body(body, 'application/json', cache_control='no-store')
+            return
+
+        # Handle the metrics endpoint
+        if self.path == '/metrics':
+            self.send_body(render_metrics().encode(), 'text/plain; version=0.0.4; charset=utf-8',
+                           cache_control='no-store')
+            return
+
+        # Handle the JSON catalog API
+        if self.path == '/api/games' or self.path.startswith('/api/games?'):
+            from urllib.parse import urlparse, parse_qs
+            query = parse_qs(urlparse(self.path).query)
+            
+            try:
+                page = int(query.get('page', ['1'])[0])
+                per_page = int(query.get('per_page', [str(API_DEFAULT_PER_PAGE)])[0])
+            except ValueError:
+                self.send_json_error(400, "page and per_page must be integers")
+                return
+            if page < 1 or not 1 <= per_page <= API_MAX_PER_PAGE:
+                self.send_json_error(400, f"page must be at least 1 and per_page between 1 and {API_MAX_PER_PAGE}")
+                return
+            
+            fields = None
+            if 'fields' in query:
+                fields = tuple(sorted(set(f.strip() for f in query['fields'][0].split(",") if f.strip())))
+                unknown = [field for field in fields if field not in API_FIELDS]
+                if unknown:
+                    self.send_json_error(400, f"Unknown fields: {', '.join(unknown)}; "
+                                              f"choose from {', '.join(API_FIELDS)}")
+                    return
+            
+            self.send_page(self.cached_page(('api/games', (page, per_page, fields)), CATALOG.version,
+                                          lambda: self.render_games_api(page, per_page, fields)))
+            return
+
         # Handle game launcher requests
         if self.path.startswith('/game_launcher'):
             # Parse query parameters
@@ -315,18 +1832,12 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
             
             if 'game' in query:
                 game_name = query['game'][0]
+                entry = CATALOG.get(game_name)
                 
-                # Find the actual game directory
-                actual_game_dir = None
-                for d in os.listdir(GAMES_DIR):
-                    if d.lower().replace(" ", "-") == game_name and os.path.isdir(os.path.join(GAMES_DIR, d)):
-                        actual_game_dir = d
-                        break
-                
-                if actual_game_dir:
+                if entry:
                     # Use the direct HTML approach instead of trying to build with Pygbag
                     # This is more reliable across different systems
-                    self.serve_direct_game_page(game_name, actual_game_dir)
+                    self.serve_direct_game_page(entry)
                     return
                 else:
                     self.serve_error_page(f"Game not found: {game_name}")
@@ -340,16 +1851,10 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
             
             if 'game' in query:
                 game_name = query['game'][0]
+                entry = CATALOG.get(game_name)
                 
-                # Find the actual game directory
-                actual_game_dir = None
-                for d in os.listdir(GAMES_DIR):
-                    if d.lower().replace(" ", "-") == game_name and os.path.isdir(os.path.join(GAMES_DIR, d)):
-                        actual_game_dir = d
-                        break
-                
-                if actual_game_dir:
-                    self.serve_play_instructions(actual_game_dir, game_name)
+                if entry:
+                    self.serve_play_instructions(entry)
                     return
                 else:
                     self.serve_error_page(f"Game not found: {game_name}")
@@ -358,36 +1863,237 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
         # For all other requests, let SimpleHTTPRequestHandler handle it
         super().do_GET()
 
-    def serve_direct_game_page(self, game_name, actual_game_dir):
-        """Serves a direct HTML page with game info and screenshots"""
+    def send_head(self):
+        """Sends headers for a static file, using the gzip variant and cache validators where possible"""
+        from urllib.parse import urlparse
+        # HEAD never reaches copyfile, so clear what an earlier request on this connection left behind
+        self.response_parts = None
+        self.response_trailer = b""
+        request_path = path = self.translate_path(self.path)
+        
+        # The compressed variants are an implementation detail, not content
+        if os.path.abspath(path).startswith(os.path.join(FRONTEND_DIR, ".cache")):
+            self.send_error(404, "File not found")
+            return None
+        
+        # Files served a moment ago are answered without touching the disk
+        info = STATIC_FILES.recent(request_path)
+        if info is None:
+            if os.path.isdir(path):
+                if not urlparse(self.path).path.endswith('/'):
+                    return super().send_head()
+                for index in "index.html", "index.htm":
+                    if os.path.isfile(os.path.join(path, index)):
+                        path = os.path.join(path, index)
+                        break
+                else:
+                    return super().send_head()
+            
+            # Pages that load the bundles or register a service worker are served in their rewritten form
+            path = precache_path(BUNDLES.page_for(path))
+            info = STATIC_FILES.lookup(path, self.guess_type(path), alias=request_path)
+            if info is None:
+                return super().send_head()
+        
+        # Ranges always refer to the uncompressed file
+        range_header = self.headers.get('Range')
+        if range_header and not self.range_still_valid(info):
+            range_header = None
+        use_gzip = (info.gzip_path is not None and not range_header
+                    and accepts_gzip(self.headers.get('Accept-Encoding')))
+        etag = info.gzip_etag if use_gzip else info.etag
+        
+        # Conditional requests are answered from the index without opening the file
+        if self.not_modified(info, etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', info.cache_control)
+            if info.gzip_path:
+                self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+        
+        ranges = parse_byte_ranges(range_header, info.size) if range_header else None
+        if ranges == []:
+            self.send_response(416)
+            self.send_header('Content-Range', f"bytes */{info.size}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        if ranges and len(ranges) > MAX_RANGES:
+            ranges = None
+        
+        body = FILE_CACHE.get(info, use_gzip)
+        self.cache_outcome = 'miss' if body is None else 'hit'
+        if body is not None:
+            f = io.BytesIO(body)
+        else:
+            try:
+                f = open(info.gzip_path if use_gzip else info.path, 'rb')
+            except OSError:
+                self.send_error(404, "File not found")
+                return None
+        
+        if ranges:
+            self.send_response(206)
+            if len(ranges) == 1:
+                start, end = ranges[0]
+                self.response_parts = [(b"", start, end - start + 1)]
+                self.response_trailer = b""
+                self.send_header('Content-type', info.content_type)
+                self.send_header('Content-Range', f"bytes {start}-{end}/{info.size}")
+            else:
+                # Multiple ranges are sent as multipart/byteranges
+                boundary = info.digest[:24]
+                self.response_parts = []
+                for start, end in ranges:
+                    part_headers = (f"\r\n--{boundary}\r\n"
+                                    f"Content-Type: {info.content_type}\r\n"
+                                    f"Content-Range: bytes {start}-{end}/{info.size}\r\n\r\n")
+                    self.response_parts.append((part_headers.encode('latin-1'), start, end - start + 1))
+                self.response_trailer = f"\r\n--{boundary}--\r\n".encode('latin-1')
+                self.send_header('Content-type', f"multipart/byteranges; boundary={boundary}")
+            content_length = sum(len(prefix) + length for prefix, _, length in self.response_parts)
+            self.send_header('Content-Length', str(content_length + len(self.response_trailer)))
+        else:
+            size = info.gzip_size if use_gzip else info.size
+            self.response_parts = [(b"", 0, size)]
+            self.response_trailer = b""
+            self.send_response(200)
+            self.send_header('Content-type', info.content_type)
+            self.send_header('Content-Length', str(size))
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+        
+        if info.gzip_path:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(info.mtime))
+        self.send_header('Cache-Control', info.cache_control)
+        self.end_headers()
+        return f
+
+    def range_still_valid(self, info):
+        """Checks If-Range: a Range only applies if the client's copy is still current"""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            return if_range == info.etag
+        return if_range == self.date_time_string(info.mtime)
+
+    def copyfile(self, source, outputfile):
+        """Sends the parts chosen by send_head, using sendfile for large regions"""
+        parts = self.response_parts
+        self.response_parts = None
+        if parts is None:
+            # Directory listings and other generated bodies
+            return super().copyfile(source, outputfile)
+        
+        for prefix, start, length in parts:
+            if prefix:
+                outputfile.write(prefix)
+                self.bytes_sent += len(prefix)
+            if length <= SMALL_FILE_SIZE:
+                source.seek(start)
+                outputfile.write(source.read(length))
+                self.bytes_sent += length
+            else:
+                # Headers are still in the write buffer; they must go out before the file bytes
+                outputfile.flush()
+                self.bytes_sent += self.connection.sendfile(source, offset=start, count=length)
+        if self.response_trailer:
+            outputfile.write(self.response_trailer)
+            self.bytes_sent += len(self.response_trailer)
+
+    def not_modified(self, info, etag):
+        """Checks If-None-Match, falling back to If-Modified-Since"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            return etag_matches(if_none_match, info.etag) or etag_matches(if_none_match, info.gzip_etag or etag)
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            import email.utils
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, IndexError, OverflowError, ValueError):
+                return False
+            if since.tzinfo is not None:
+                return int(info.mtime) <= since.timestamp()
+        return False
+
+    def serve_launch_events(self, launch_id):
+        """Sends event-stream headers, then hands the connection to the event hub"""
+        launch = SUPERVISOR.get(launch_id)
+        if launch is None:
+            self.send_json_error(404, f"Unknown launch: {launch_id}")
+            return
+        try:
+            last_event_id = int(self.headers.get('Last-Event-ID', '0'))
+        except ValueError:
+            last_event_id = 0
+        
+        # 204 tells EventSource to stop reconnecting once it has seen everything
+        missed, more = EVENT_HUB.backlog(launch, last_event_id)
+        if not missed and not more:
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
         self.send_response(200)
-        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Connection', 'close')
         self.end_headers()
+        self.wfile.flush()
         
-        game_path = os.path.join(GAMES_DIR, actual_game_dir)
+        # Detaching leaves this handler's socket object closed, so finishing the request
+        # does not shut the connection down; the hub owns it from here on
+        self.close_connection = True
+        EVENT_HUB.subscribe(socket.socket(fileno=self.connection.detach()), launch, last_event_id)
+
+    def send_json_error(self, status, message):
+        """Sends an API error as a small JSON document"""
+        self.send_body(json.dumps({'error': message}).encode(), 'application/json', status)
+
+    @staticmethod
+    def render_games_api(page, per_page, fields):
+        """Builds one page of the JSON catalog"""
+        records, records_hash = CATALOG.records()
+        start = (page - 1) * per_page
+        games = records[start:start + per_page]
+        if fields:
+            games = [{key: record[key] for key in fields if key in record} for record in games]
         
-        # Find an image to display
-        image_path = None
-        for img_name in ["app.png", "app.gif", "screenshot.png", "preview.png"]:
-            img_path = os.path.join(game_path, img_name)
-            if os.path.exists(img_path):
-                image_path = img_path
-                break
+        body = json.dumps({
+            'games': games,
+            'page': page,
+            'per_page': per_page,
+            'total': len(records),
+            'pages': (len(records) + per_page - 1) // per_page
+        }, separators=(',', ':')).encode()
         
-        # Get game description
-        description = ""
-        readme_path = os.path.join(game_path, "README.md")
-        if os.path.exists(readme_path):
-            try:
-                with open(readme_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    if lines:
-                        description = lines[0].strip()
-                        # Get more description if available
-                        if len(lines) > 1:
-                            description += "<br><br>" + lines[1].strip()
-            except Exception as e:
-                print(f"Warning: Could not read README for {actual_game_dir}: {e}")
+        # Weak tag that only changes with the catalog contents and the query
+        query_tag = f"{page}-{per_page}-{','.join(fields) if fields else 'all'}"
+        return CachedPage(body, content_type='application/json',
+                          etag=f'W/"{records_hash}-{hashlib.sha1(query_tag.encode()).hexdigest()[:8]}"')
+
+    def serve_direct_game_page(self, entry):
+        """Serves a direct HTML page with game info and screenshots"""
+        self.send_page(self.cached_page(('game_launcher', entry.slug), entry.signature,
+                                      lambda: self.render_game_page(entry)))
+
+    @staticmethod
+    def render_game_page(entry):
+        """Builds the game info page"""
+        game_name = entry.slug
+        actual_game_dir = entry.name
+        image_path = entry.thumbnail
+        description = entry.details
         
         # Create the HTML page
         html = f"""<!DOCTYPE html>
@@ -514,7 +2220,7 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
         # Add image if available
         if image_path:
             # Get relative path for the image
-            rel_image_path = os.path.join("/game-assets", game_name, os.path.basename(image_path))
+            rel_image_path = "/" + entry.thumbnail_url
             html += f"""
             <div class="game-image">
                 <img src="{rel_image_path}" alt="{actual_game_dir} screenshot">
@@ -565,15 +2271,16 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
 </body>
 </html>
 """
-        
-        self.wfile.write(html.encode())
+        return CachedPage(html)
 
-    def serve_error_page(self, message):
+    def serve_error_page(self, message, status=404):
         """Creates an error page"""
-        self.send_response(404)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        
+        # Not cached: messages carry request input, so every unknown slug would take a cache slot
+        self.send_page(self.render_error_page(message, status))
+
+    @staticmethod
+    def render_error_page(message, status=404):
+        """Builds the error page"""
         html = f"""<!DOCTYPE html>
 <html>
 <head>
@@ -621,13 +2328,18 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
     </div>
 </body>
 </html>"""
-        self.wfile.write(html.encode())
+        return CachedPage(html, status)
 
-    def serve_play_instructions(self, actual_game_dir, game_name):
+    def serve_play_instructions(self, entry):
         """Serves instructions for playing the game locally with a direct launch option"""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
+        self.send_page(self.cached_page(('play-desktop-game', entry.slug), entry.signature,
+                                      lambda: self.render_play_instructions(entry)))
+
+    @staticmethod
+    def render_play_instructions(entry):
+        """Builds the play instructions page"""
+        actual_game_dir = entry.name
+        game_name = entry.slug
         
         html = f"""<!DOCTYPE html>
 <html>
@@ -873,28 +2585,342 @@ class GameHandler(http.server.SimpleHTTPRequestHandler):
     </script>
 </body>
 </html>"""
-        self.wfile.write(html.encode())
+        return CachedPage(html)
+
+    @staticmethod
+    def render_game_launched_page():
+        """Builds the page shown after a game was launched"""
+        html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Game Launched</title>
+    <style>
+        body {{
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background-color: #2c3e50;
+            color: white;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            height: 100vh;
+            margin: 0;
+            padding: 20px;
+            text-align: center;
+        }}
+        .container {{
+            background-color: rgba(0,0,0,0.3);
+            padding: 30px;
+            border-radius: 15px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+            max-width: 600px;
+        }}
+        h1 {{
+            color: #2ecc71;
+        }}
+        p {{
+            font-size: 1.2rem;
+            line-height: 1.6;
+            margin: 20px 0;
+        }}
+        .reminder {{
+            background-color: rgba(52, 152, 219, 0.2);
+            border-left: 4px solid #3498db;
+            padding: 10px 15px;
+            margin: 20px 0;
+            text-align: left;
+            border-radius: 0 5px 5px 0;
+        }}
+        button {{
+            background-color: #3498db;
+            color: white;
+            border: none;
+            padding: 12px 25px;
+            font-size: 1.1rem;
+            border-radius: 8px;
+            cursor: pointer;
+            margin-top: 20px;
+        }}
+        .keyboard {{
+            display: inline-block;
+            background-color: #34495e;
+            padding: 3px 8px;
+            border-radius: 4px;
+            font-family: Consolas, monospace;
+            margin: 0 2px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1 id="launch-title">Game Launched!</h1>
+        <p id="launch-status">The game is now running in a separate window.</p>
+        <div class="reminder">
+            <p><strong>Remember:</strong> Press <span class="keyboard">F10</span> to leave the game when you're done playing.</p>
+        </div>
+        <button onclick="window.location.href='/'">Return to Game Collection</button>
+    </div>
+    <script>
+        // Follow the launch as it happens instead of assuming it worked
+        const launchId = new URLSearchParams(window.location.search).get('launch');
+        if (launchId && window.EventSource) {{
+            const title = document.getElementById('launch-title');
+            const status = document.getElementById('launch-status');
+            const events = new EventSource('/api/launches/' + launchId + '/events');
+            events.addEventListener('spawn', (e) => {{
+                const data = JSON.parse(e.data);
+                title.textContent = 'Starting ' + data.title + '...';
+                status.textContent = 'Waiting for the game window to open.';
+            }});
+            events.addEventListener('first-frame', () => {{
+                title.textContent = 'Game Launched!';
+                status.textContent = 'The game is now running in a separate window.';
+            }});
+            events.addEventListener('error', (e) => {{
+                if (e.data) {{
+                    title.textContent = 'Something went wrong';
+                    status.textContent = JSON.parse(e.data).message;
+                }}
+            }});
+            events.addEventListener('exit', (e) => {{
+                if (JSON.parse(e.data).exitCode === 0) {{
+                    title.textContent = 'Game Closed';
+                    status.textContent = 'Thanks for playing!';
+                }}
+                events.close();
+            }});
+        }}
+    </script>
+</body>
+</html>"""
+        return CachedPage(html)
+
+# Metrics text including the cache and launch statistics kept by other components
+def render_metrics():
+    gauges = []
+    if ACCESS_LOG.enabled:
+        gauges.append(('portal_access_log_written_total', (), ACCESS_LOG.written, "counter"))
+    gauges.append(('portal_file_cache_bytes', (), FILE_CACHE.used, "gauge"))
+    gauges.append(('portal_file_cache_budget_bytes', (), FILE_CACHE.budget, "gauge"))
+    status = SUPERVISOR.status()
+    gauges.append(('portal_games_running', (), status['running'], "gauge"))
+    gauges.append(('portal_games_max_running', (), status['maxRunning'], "gauge"))
+    gauges.append(('portal_event_streams_open', (), EVENT_HUB.open_streams(), "gauge"))
+    return METRICS.render(gauges)
+
+# Point query-string routes at their prerendered files
+def rewrite_prerendered_links(html):
+    return PRERENDERED_LINK.sub(lambda match: f"/{match.group(1)}/{match.group(2)}.html", html)
+
+# Write the whole portal to out_dir so any static file server can host it:
+# the frontend files, prerendered game pages, .gz variants and a manifest of hashes
+def export_site(out_dir):
+    import mimetypes
+    out_dir = os.path.abspath(out_dir)
+    if out_dir == FRONTEND_DIR or out_dir.startswith(FRONTEND_DIR + os.sep):
+        raise ValueError("The export directory must be outside the frontend directory")
+    
+    # Only replace a directory this function wrote before
+    if os.path.isdir(out_dir) and os.listdir(out_dir):
+        if not os.path.isfile(os.path.join(out_dir, EXPORT_MANIFEST)):
+            raise ValueError(f"{out_dir} is not empty and is not an earlier export")
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    
+    # Everything served from disk, with the bundled pages in place of their sources
+    files = {}
+    for root, dirs, names in os.walk(FRONTEND_DIR):
+        dirs[:] = sorted(d for d in dirs if d not in EXPORT_SKIP)
+        for name in sorted(names):
+            if name in EXPORT_SKIP:
+                continue
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, FRONTEND_DIR).replace(os.sep, "/")
+            files[rel_path] = BUNDLES.page_for(path)
+    files.update(precache_files())
+    
+    manifest = {}
+    def export_file(rel_path, data=None, source=None):
+        out_path = os.path.join(out_dir, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        if rel_path.endswith(".html"):
+            if data is None:
+                with open(source, 'rb') as f:
+                    data = f.read()
+            data = rewrite_prerendered_links(data.decode('utf-8')).encode('utf-8')
+        if data is None:
+            shutil.copy2(source, out_path)
+        else:
+            with open(out_path, 'wb') as f:
+                f.write(data)
+        
+        content_type = mimetypes.guess_type(out_path)[0] or 'application/octet-stream'
+        info = StaticFile(out_path, os.stat(out_path), content_type, wait_for_gzip=True)
+        record = {'sha256': info.digest, 'size': info.size, 'contentType': content_type}
+        if info.gzip_path:
+            shutil.copyfile(info.gzip_path, out_path + ".gz")
+            record['gzipSize'] = info.gzip_size
+        manifest[rel_path] = record
+    
+    with PROFILER.phase("static export"):
+        for rel_path, source in files.items():
+            export_file(rel_path, source=source)
+        for entry in CATALOG.games():
+            export_file(f"game_launcher/{entry.slug}.html", GameHandler.render_game_page(entry).body)
+            export_file(f"play-desktop-game/{entry.slug}.html", GameHandler.render_play_instructions(entry).body)
+    
+    content = json.dumps({'files': manifest}, indent=2, sort_keys=True).encode('utf-8')
+    write_file_atomic(os.path.join(out_dir, EXPORT_MANIFEST), content)
+    print(f"Exported {len(manifest)} files to {out_dir}")
+
+# HTTP server that serves each connection from a bounded pool of worker threads
+class PortalServer(http.server.HTTPServer):
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, max_workers=MAX_WORKERS):
+        super().__init__(server_address, handler_class)
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="portal-worker")
+        # Stop accepting new connections while every worker is busy; they wait in the listen backlog
+        self.worker_slots = threading.BoundedSemaphore(max_workers)
+        # Keep-alive connections waiting for their next request, oldest first
+        self.idle_connections = OrderedDict()
+        self.idle_lock = threading.Lock()
+
+    @contextmanager
+    def connection_idle(self, connection):
+        """Marks a connection as closable while its worker waits for the next request"""
+        with self.idle_lock:
+            self.idle_connections[connection] = None
+        try:
+            yield
+        finally:
+            with self.idle_lock:
+                self.idle_connections.pop(connection, None)
+
+    def close_idle_connection(self):
+        """Frees a worker by closing the longest idle keep-alive connection. Returns False if there is none."""
+        with self.idle_lock:
+            if not self.idle_connections:
+                return False
+            connection, _ = self.idle_connections.popitem(last=False)
+        # Clients retry a request on a kept-alive connection the server closed, so this is safe
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        return True
+
+    def process_request(self, request, client_address):
+        # A new visitor should not wait out another client's idle timeout
+        if not self.worker_slots.acquire(blocking=False):
+            self.close_idle_connection()
+            self.worker_slots.acquire()
+        try:
+            self.executor.submit(self.process_request_thread, request, client_address)
+        except Exception:
+            self.worker_slots.release()
+            self.shutdown_request(request)
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.worker_slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+# Bind the portal server; port 0 picks a free port (see server_address)
+def create_server(port=PORT, workers=MAX_WORKERS, idle_timeout=IDLE_TIMEOUT, handler=GameHandler):
+    handler.timeout = idle_timeout
+    if workers > 0:
+        return PortalServer(("", port), handler, max_workers=workers)
+    # Keep-alive would let one client hold the only connection slot
+    handler.protocol_version = "HTTP/1.0"
+    return socketserver.TCPServer(("", port), handler)
 
 def main():
-    # Create necessary directories and files
-    setup_asset_directories()
-    create_game_players()
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Game Collection web portal")
+    parser.add_argument("--port", type=int, default=PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help="Maximum number of concurrent connections (0 serves one connection at a time)")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="Seconds before an idle keep-alive connection is closed")
+    parser.add_argument("--max-games", type=int, default=MAX_RUNNING_GAMES,
+                        help="Maximum number of games launched from the portal that may run at once")
+    parser.add_argument("--launch-mode", choices=LAUNCH_MODES, default="direct",
+                        help="Start games directly, or through the desktop launcher window")
+    parser.add_argument("--file-cache-mb", type=float, default=FILE_CACHE_BUDGET / (1024 * 1024),
+                        help="Memory for caching small static files (0 disables the cache)")
+    parser.add_argument("--build-web", action="store_true",
+                        help="Build missing or outdated pygbag bundles in the background (needs pygbag)")
+    parser.add_argument("--build-workers", type=int, default=None,
+                        help="Processes used for web builds (default: one per CPU core)")
+    parser.add_argument("--access-log", metavar="FILE",
+                        help="Write a JSON-lines access log to FILE instead of logging requests to stderr")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Write the portal as static files to DIR and exit instead of serving it")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print how long each startup phase took")
+    args = parser.parse_args()
+    PROFILER.enabled = args.profile_startup
+    SUPERVISOR.max_running = args.max_games
+    SUPERVISOR.mode = args.launch_mode
+    FILE_CACHE.budget = int(args.file_cache_mb * 1024 * 1024)
     
-    # Prepare games data
-    generate_games_data()
+    # Index the games once and keep the index up to date in the background
+    with PROFILER.phase("catalog build"):
+        CATALOG.refresh()
     
-    # Start the server
-    handler = GameHandler
+    # Create necessary directories and files, rewriting only what changed
+    build_frontend()
+    if args.export:
+        try:
+            export_site(args.export)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        PROFILER.report()
+        return
+    CATALOG.add_listener(build_frontend)
     
+    # Keep web builds up to date without blocking requests
+    if args.build_web:
+        if WebBuildQueue.available():
+            BUILD_QUEUE.workers = args.build_workers or BUILD_QUEUE.workers
+            BUILD_QUEUE.submit_changed()
+            CATALOG.add_listener(BUILD_QUEUE.submit_changed)
+            BUILD_QUEUE.watch()
+        else:
+            print("Warning: pygbag is not installed, web builds are disabled")
+    CATALOG.watch()
+    
+    if args.access_log:
+        ACCESS_LOG.open(args.access_log)
+    
+    # Start the server
     try:
-        with socketserver.TCPServer(("", PORT), handler) as httpd:
-            print(f"Server started at http://localhost:{PORT}")
+        with PROFILER.phase("socket bind"):
+            httpd = create_server(args.port, args.workers, args.idle_timeout)
+        PROFILER.report()
+        with httpd:
+            print(f"Server started at http://localhost:{httpd.server_address[1]}")
             print("Press Ctrl+C to stop the server")
             httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped.")
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        BUILD_QUEUE.shutdown()
+        ACCESS_LOG.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
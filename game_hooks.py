@@ -0,0 +1,90 @@
+# Hooks shared by the desktop launcher and the web portal for running a game in a
+# process of its own; pygame is only imported inside the game process
+import os
+import subprocess
+import runpy
+
+# Environment variable naming the pipe a game reports its first frame on
+FRAME_FD_ENV = "GAME_FRAME_FD"
+
+# Raised inside a game when the player presses F10; a SystemExit so games' own
+# "except Exception" handlers do not swallow it
+class ReturnToLauncher(SystemExit):
+    pass
+
+# Make F10 end the game by watching every way a game can read events
+def install_return_hotkey():
+    import pygame
+    original_get, original_poll, original_wait = pygame.event.get, pygame.event.poll, pygame.event.wait
+
+    def check(event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F10:
+            raise ReturnToLauncher(0)
+        return event
+
+    def get(*args, **kwargs):
+        events = original_get(*args, **kwargs)
+        for event in events:
+            check(event)
+        return events
+
+    pygame.event.get = get
+    pygame.event.poll = lambda: check(original_poll())
+    pygame.event.wait = lambda *args, **kwargs: check(original_wait(*args, **kwargs))
+
+# Report the first presented frame on the file descriptor the parent passed in
+def install_first_frame_report(frame_fd):
+    import pygame.display
+    originals = (pygame.display.flip, pygame.display.update)
+
+    def report_first_frame(original):
+        def present(*args, **kwargs):
+            pygame.display.flip, pygame.display.update = originals
+            result = original(*args, **kwargs)
+            try:
+                os.write(frame_fd, b"1")
+                os.close(frame_fd)
+            except OSError:
+                pass
+            return result
+        return present
+
+    pygame.display.flip = report_first_frame(originals[0])
+    pygame.display.update = report_first_frame(originals[1])
+
+# Run a game script as __main__ in this process; F10 ends it, and its first frame is
+# reported if the parent asked for it
+def run_game(script):
+    frame_fd = int(os.environ.pop(FRAME_FD_ENV, "-1"))
+    install_return_hotkey()
+    if frame_fd >= 0:
+        install_first_frame_report(frame_fd)
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except ReturnToLauncher:
+        pass
+
+# Start a process that runs a game through run_game(). Returns the process and the read
+# end of its first-frame pipe, or None where there is no fd passing and so no report.
+def spawn_with_frame_pipe(command, **popen_args):
+    if os.name != "posix":
+        return subprocess.Popen(command, **popen_args), None
+
+    read_fd, write_fd = os.pipe()
+    env = dict(popen_args.pop("env", None) or os.environ)
+    env[FRAME_FD_ENV] = str(write_fd)
+    try:
+        process = subprocess.Popen(command, env=env, pass_fds=(write_fd,), **popen_args)
+    except Exception:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+    return process, read_fd
+
+# Block until the game presents its first frame; False if it exited before drawing
+def wait_for_first_frame(frame_fd):
+    try:
+        return bool(os.read(frame_fd, 16))
+    finally:
+        os.close(frame_fd)
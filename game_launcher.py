@@ -3,6 +3,12 @@ import sys
 import pygame
 import importlib.util
 import subprocess
+import hashlib
+import functools
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from game_hooks import run_game, spawn_with_frame_pipe, wait_for_first_frame
 
 # Initialize pygame
 pygame.init()
@@ -11,8 +17,19 @@ pygame.init()
 WIDTH, HEIGHT = 800, 600
 TITLE = "Game Collection Launcher"
 FPS = 60
+RENDER_MODES = ("event", "continuous")  # Redraw only on input, or every frame
 GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Thumbnail settings
+THUMB_SIZE = (200, 150)
+THUMB_CACHE_DIR = os.path.join(GAMES_DIR, ".launcher-cache", "thumbs")
+THUMB_MEMORY_LIMIT = 16 * 1024 * 1024  # Bytes of decoded thumbnails kept in memory
+
+# Catalog settings
+CATALOG_MANIFEST = os.path.join(GAMES_DIR, ".launcher-cache", "catalog.json")
+CATALOG_VERSION = 1
+SCAN_WORKERS = 8  # Threads probing game directories on a cold scan
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -37,6 +54,11 @@ except:
     font_medium = pygame.font.SysFont('Arial', 36)
     font_small = pygame.font.SysFont('Arial', 24)
 
+# Rendered text is reused, since labels rarely change between frames
+@functools.lru_cache(maxsize=256)
+def render_text(font, text, color):
+    return font.render(text, True, color)
+
 # Button class
 class Button:
     def __init__(self, x, y, width, height, text, color=LIGHT_GRAY, hover_color=WHITE, text_color=BLACK):
@@ -52,7 +74,7 @@ class Button:
         pygame.draw.rect(surface, color, self.rect, border_radius=15)
         pygame.draw.rect(surface, BLACK, self.rect, 2, border_radius=15)
         
-        text_surf = font_medium.render(self.text, True, self.text_color)
+        text_surf = render_text(font_medium, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
         
@@ -63,219 +85,405 @@ class Button:
     def clicked(self, pos, click):
         return self.rect.collidepoint(pos) and click
 
+# Scaled thumbnails, cached on disk as raw RGBA pixels and in memory as surfaces
+class ThumbnailCache:
+    def __init__(self, cache_dir=THUMB_CACHE_DIR, memory_limit=THUMB_MEMORY_LIMIT):
+        self.cache_dir = cache_dir
+        self.memory_limit = memory_limit
+        self.surfaces = OrderedDict()
+        self.memory_used = 0
+        self.failed = set()
+
+    def get(self, image_path):
+        """Returns the thumbnail for an image, or None if it cannot be loaded"""
+        # The draw loop asks on every frame, so thumbnails already in memory are returned
+        # without touching the disk; an image edited while the launcher runs shows on the next start
+        surface = self.surfaces.get(image_path)
+        if surface is not None:
+            self.surfaces.move_to_end(image_path)
+            return surface
+        if image_path in self.failed:
+            return None
+        
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            self.failed.add(image_path)
+            return None
+        key = f"{os.path.abspath(image_path)}:{stat.st_mtime_ns}:{stat.st_size}:{THUMB_SIZE[0]}x{THUMB_SIZE[1]}"
+        
+        surface = self.load_cached(key)
+        if surface is None:
+            try:
+                surface = pygame.transform.scale(pygame.image.load(image_path), THUMB_SIZE)
+                if surface.get_colorkey() is not None:
+                    # The disk cache only keeps RGBA, so turn a GIF's transparent color into alpha
+                    keyed, surface = surface, pygame.Surface(THUMB_SIZE, pygame.SRCALPHA)
+                    surface.blit(keyed, (0, 0))
+            except Exception as e:
+                print(f"Error loading image {image_path}: {e}")
+                self.failed.add(image_path)
+                return None
+            self.store(key, surface)
+        
+        # Match the display's pixel format so blitting needs no conversion, keeping alpha only where it is used
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+        self.remember(image_path, surface)
+        return surface
+
+    def cache_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".rgba")
+
+    def load_cached(self, key):
+        """Reads pre-scaled pixels from the disk cache without decoding the image"""
+        try:
+            with open(self.cache_path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) != THUMB_SIZE[0] * THUMB_SIZE[1] * 4:
+            return None
+        # Opaque thumbnails are loaded without an alpha channel so they blit at full speed
+        if min(data[3::4]) == 255:
+            return pygame.image.frombuffer(data, THUMB_SIZE, "RGBX")
+        return pygame.image.frombuffer(data, THUMB_SIZE, "RGBA")
+
+    def store(self, key, surface):
+        """Writes the scaled pixels to the disk cache; a failed write only costs a decode next time"""
+        path = self.cache_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(pygame.image.tostring(surface, "RGBA"))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache thumbnail: {e}")
+
+    def remember(self, image_path, surface):
+        """Keeps a surface in memory, dropping the least recently shown ones over the limit"""
+        self.surfaces[image_path] = surface
+        self.memory_used += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.memory_used > self.memory_limit and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.memory_used -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+
+THUMBNAILS = ThumbnailCache()
+
 # Game class to store information about each game
 class Game:
-    def __init__(self, name, directory, description=""):
+    def __init__(self, name, directory, description="", image_path=None, main_file=None):
         self.name = name
         self.directory = directory
         self.description = description
-        self.image_path = os.path.join(directory, "app.png")
-        if not os.path.exists(self.image_path):
-            # Try other common screenshot filenames
-            for alt_name in ["app.gif", "screenshot.png", "preview.png", "app.jpg"]:
-                alt_path = os.path.join(directory, alt_name)
-                if os.path.exists(alt_path):
-                    self.image_path = alt_path
-                    break
-            else:
-                self.image_path = None
-        
-        self.main_file = os.path.join(directory, "main.py")
-        if not os.path.exists(self.main_file):
-            for alt_name in ["game.py", "run.py"]:
-                alt_path = os.path.join(directory, alt_name)
-                if os.path.exists(alt_path):
-                    self.main_file = alt_path
-                    break
+        self.image_path = image_path
+        self.main_file = main_file or os.path.join(directory, "main.py")
         
-        # Load icon/preview image if available
-        self.image = None
-        if self.image_path and os.path.exists(self.image_path):
-            try:
-                self.image = pygame.image.load(self.image_path)
-                # Standardize thumbnail size
-                self.image = pygame.transform.scale(self.image, (200, 150))
-            except Exception as e:
-                print(f"Error loading image for {name}: {e}")
-                self.image = None
+    @property
+    def image(self):
+        # Loaded when the game is first shown, not when the collection is scanned
+        if not self.image_path:
+            return None
+        return THUMBNAILS.get(self.image_path)
+
+# Modification times that decide whether a manifest entry is still valid; the README
+# is checked on its own because editing it in place leaves the directory mtime alone
+def game_signature(item_path):
+    signature = [os.stat(item_path).st_mtime_ns]
+    try:
+        signature.append(os.stat(os.path.join(item_path, "README.md")).st_mtime_ns)
+    except OSError:
+        signature.append(None)
+    return signature
+
+# Probe one game directory for its files; runs on the discovery pool for cold scans
+def scan_game(item, item_path):
+    entry = {"signature": game_signature(item_path), "is_game": False}
+    # A directory is a game if it has a main.py or game.py file
+    if not (os.path.exists(os.path.join(item_path, "main.py"))
+            or os.path.exists(os.path.join(item_path, "game.py"))):
+        return entry
+    entry["is_game"] = True
+    
+    # Read README.md for description if available
+    description = ""
+    readme_path = os.path.join(item_path, "README.md")
+    if os.path.exists(readme_path):
+        try:
+            with open(readme_path, 'r', encoding='utf-8') as f:
+                description = f.readline().strip()
+        except (OSError, UnicodeDecodeError):
+            pass
+    entry["description"] = description
+    
+    # Try common screenshot filenames in order of preference
+    entry["image"] = None
+    for image_name in ["app.png", "app.gif", "screenshot.png", "preview.png", "app.jpg"]:
+        if os.path.exists(os.path.join(item_path, image_name)):
+            entry["image"] = image_name
+            break
+    
+    entry["main"] = "main.py"
+    if not os.path.exists(os.path.join(item_path, "main.py")):
+        for alt_name in ["game.py", "run.py"]:
+            if os.path.exists(os.path.join(item_path, alt_name)):
+                entry["main"] = alt_name
+                break
+    return entry
+
+# Read the catalog manifest; a missing or damaged one just means a cold scan
+def load_manifest(path=CATALOG_MANIFEST):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != CATALOG_VERSION:
+        return {}
+    return manifest.get("games", {})
+
+# Write the catalog manifest atomically so a crash never leaves half a file behind
+def save_manifest(entries, path=CATALOG_MANIFEST):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CATALOG_VERSION, "games": entries}, f, indent=1, sort_keys=True)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not save the game catalog: {e}")
 
 # Find all games in the directory
 def find_games():
+    manifest = load_manifest()
+    entries = {}
+    stale = []
+    # List all directories in the Games folder, reusing manifest entries whose mtimes match
+    with os.scandir(GAMES_DIR) as listing:
+        for item in listing:
+            if not item.is_dir() or item.name == "__pycache__" or item.name.startswith("."):
+                continue
+            entry = manifest.get(item.name)
+            try:
+                if entry is not None and entry.get("signature") == game_signature(item.path):
+                    entries[item.name] = entry
+                    continue
+            except OSError:
+                continue
+            stale.append(item)
+    
+    # The probes are a handful of stats and a small read per directory, so threads overlap the I/O
+    if len(stale) > 1:
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(stale))) as pool:
+            scanned = pool.map(lambda item: scan_game(item.name, item.path), stale)
+            entries.update(zip((item.name for item in stale), scanned))
+    else:
+        for item in stale:
+            entries[item.name] = scan_game(item.name, item.path)
+    
+    if stale or entries.keys() != manifest.keys():
+        save_manifest(entries)
+    
     games = []
-    # List all directories in the Games folder
-    for item in os.listdir(GAMES_DIR):
+    for item, entry in entries.items():
+        if not entry["is_game"]:
+            continue
         item_path = os.path.join(GAMES_DIR, item)
-        # Check if it's a directory and has a main.py or game.py file
-        if os.path.isdir(item_path) and item != "__pycache__":
-            main_py = os.path.join(item_path, "main.py")
-            game_py = os.path.join(item_path, "game.py")
-            if os.path.exists(main_py) or os.path.exists(game_py):
-                # Read README.md for description if available
-                description = ""
-                readme_path = os.path.join(item_path, "README.md")
-                if os.path.exists(readme_path):
-                    try:
-                        with open(readme_path, 'r', encoding='utf-8') as f:
-                            lines = f.readlines()
-                            if lines:
-                                description = lines[0].strip()
-                    except:
-                        pass
-                
-                games.append(Game(item, item_path, description))
+        image_path = os.path.join(item_path, entry["image"]) if entry["image"] else None
+        games.append(Game(item, item_path, entry["description"], image_path,
+                          os.path.join(item_path, entry["main"])))
     
     # Sort games alphabetically
     games.sort(key=lambda g: g.name)
     return games
 
-# Create a wrapper for launching games with a back button
-def create_game_wrapper(game_path, game_name):
-    wrapper_code = f"""
-import os
-import sys
-import subprocess
-import pygame
+# Body of a --host process: pygame is already imported and initialised, so a
+# game only pays for its own imports and assets once it is handed over
+def run_host():
+    # One JSON line names the game; end of input means the launcher closed
+    line = sys.stdin.readline()
+    if not line.strip():
+        return
+    request = json.loads(line)
+    directory, script = request["directory"], request["script"]
+    
+    # Run the game as if it had been started from its own directory
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    sys.argv = [script]
+    pygame.display.set_caption(request["name"])
+    try:
+        run_game(script)
+    finally:
+        pygame.quit()
 
-# Initialize pygame to capture key events
-pygame.init()
+# A spare --host process kept ready for the next launch
+class GameHost:
+    def __init__(self):
+        self.process = None
+        self.frame_fd = None
 
-# Set up a minimal display to capture key events
-info = pygame.display.Info()
-pygame.display.set_mode((1, 1), pygame.NOFRAME)
-pygame.display.set_caption("{game_name} - Press F10 to return to launcher")
-
-# Function to show return message overlay
-def show_return_message():
-    screen = pygame.display.get_surface()
-    font = pygame.font.SysFont('Arial', 18)
-    text = font.render("Press F10 to return to launcher", True, (255, 255, 255))
-    text_rect = text.get_rect(center=(screen.get_width()//2, 20))
-    
-    # Semi-transparent overlay
-    overlay = pygame.Surface((screen.get_width(), 40))
-    overlay.set_alpha(180)
-    overlay.fill((0, 0, 0))
-    
-    screen.blit(overlay, (0, 0))
-    screen.blit(text, text_rect)
-    pygame.display.update(pygame.Rect(0, 0, screen.get_width(), 40))
-
-# Variables to track state
-show_message_timer = 180  # Show message for 3 seconds (60fps)
-message_shown = False
-
-# Start the game process
-game_process = subprocess.Popen([sys.executable, "{os.path.basename(game_path)}"])
-
-# Main loop to check for F10 key press
-running = True
-clock = pygame.time.Clock()
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_F10:  # F10 key to return to launcher
-                running = False
-            elif event.key == pygame.K_F1:  # F1 key to show help
-                message_shown = True
-                show_message_timer = 180
-    
-    # Check if process is still running
-    if game_process.poll() is not None:
-        running = False
-    
-    # Show return message on startup or when F1 is pressed
-    if show_message_timer > 0:
-        if not message_shown:
-            show_return_message()
-            message_shown = True
-        show_message_timer -= 1
-    
-    clock.tick(60)
+    def spawn(self):
+        """Starts a spare host unless one is already waiting"""
+        if self.process is not None and self.process.poll() is None:
+            return
+        command = [sys.executable, os.path.abspath(__file__), "--host"]
+        self.process, self.frame_fd = spawn_with_frame_pipe(command, stdin=subprocess.PIPE, cwd=GAMES_DIR)
 
-# Terminate the game process if it's still running
-if game_process.poll() is None:
-    game_process.terminate()
+    def run(self, game):
+        """Hands a game to the spare host. Returns the process, the read end of its first-frame pipe
+        and the CPU seconds the host spent warming up (None where /proc is unavailable)."""
+        request = {"name": game.name, "directory": game.directory, "script": game.main_file}
+        # A spare that died while waiting (or is dying now) is replaced once
+        for attempt in range(2):
+            self.spawn()
+            process, frame_fd = self.process, self.frame_fd
+            self.process = self.frame_fd = None
+            # The host's own start-up is not the game's cost, so note where the game's share begins
+            warmup_cpu = proc_cpu_time(process.pid)
+            try:
+                process.stdin.write((json.dumps(request) + "\n").encode())
+                process.stdin.close()
+            except OSError as e:
+                if attempt:
+                    raise
+                print(f"Warning: Spare game host exited, starting a new one: {e}")
+                self.discard(process, frame_fd)
+                continue
+            return process, frame_fd, warmup_cpu
 
-pygame.quit()
-"""
-    
-    # Get the wrapper path
-    wrapper_dir = os.path.dirname(game_path)
-    wrapper_name = f"_wrapper_{os.path.basename(game_path)}"
-    wrapper_path = os.path.join(wrapper_dir, wrapper_name)
+    def discard(self, process, frame_fd):
+        """Reaps a spare host that can no longer take a game"""
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        process.kill()
+        process.wait()
+        if frame_fd is not None:
+            os.close(frame_fd)
+
+    def close(self):
+        """Lets a waiting spare exit"""
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process = None
+        if self.frame_fd is not None:
+            os.close(self.frame_fd)
+            self.frame_fd = None
+
+# CPU seconds a process has used so far, from /proc/<pid>/stat; still readable
+# while an exited child waits to be reaped
+def proc_cpu_time(pid):
+    try:
+        with open(f"/proc/{pid}/stat", 'rb') as f:
+            fields = f.read().rsplit(b")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    # utime and stime are fields 14 and 15, counted from the state field (3)
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+# Wait for a game process to exit and collect what it cost. CPU time spent before the game was
+# handed over (warmup_cpu) is left out. Returns (exit code, CPU seconds, peak RSS in bytes);
+# the last two may be None.
+def watch_game(process, warmup_cpu=None):
+    if os.name != "posix":
+        return process.wait(), None, None
     
-    # Write the wrapper script
-    with open(wrapper_path, 'w') as f:
-        f.write(wrapper_code)
+    # Wait without reaping, so /proc still describes the exited game
+    cpu_time = None
+    if hasattr(os, "waitid"):
+        try:
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            cpu_time = proc_cpu_time(process.pid)
+        except ChildProcessError:
+            return process.wait(), None, None
     
-    return wrapper_path
+    # Reaping with wait4 also reports the peak resident set size
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if cpu_time is None:
+        cpu_time = usage.ru_utime + usage.ru_stime
+    if warmup_cpu is not None:
+        cpu_time = max(cpu_time - warmup_cpu, 0.0)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return process.returncode, cpu_time, peak_rss
+
+# Posted to the launcher's event queue when a game it started has exited
+GAME_EXITED = pygame.USEREVENT + 1
 
-# Launch a game with back button functionality
-def launch_game(game, screen):
-    # Save the current directory
-    original_dir = os.getcwd()
+# Launch a game in the warm host; the launcher window stays open while it runs
+def launch_game(game, host):
+    import threading
+    import time
+    clicked = time.perf_counter()
+    print(f"Press F10 to return to launcher while playing {game.name}")
+    process, frame_fd, warmup_cpu = host.run(game)
     
-    try:
-        # Change to the game's directory
-        os.chdir(game.directory)
-        
-        # Create a wrapper script for the game
-        game_file = os.path.basename(game.main_file)
-        wrapper_path = create_game_wrapper(game_file, game.name)
-        
-        # Display a message about the back button
-        back_msg = f"Press F10 to return to launcher while playing {game.name}"
-        print(back_msg)
+    def watch():
+        if frame_fd is not None and wait_for_first_frame(frame_fd):
+            print(f"{game.name} showed its first frame {(time.perf_counter() - clicked) * 1000:.0f} ms after launch")
         
-        # Run the wrapper as a subprocess
-        process = subprocess.Popen([sys.executable, os.path.basename(wrapper_path)])
-        
-        # Wait for the wrapper to finish
-        process.wait()
-        
-        # Clean up the wrapper file
-        try:
-            os.remove(wrapper_path)
-        except:
-            pass
-        
-    except Exception as e:
-        print(f"Error launching {game.name}: {e}")
-        
-    finally:
-        # Restore the original directory
-        os.chdir(original_dir)
-        
-        # Re-initialize pygame after the game exits
-        pygame.init()
-        screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption(TITLE)
-        return screen
+        exit_code, cpu_time, peak_rss = watch_game(process, warmup_cpu)
+        played = time.perf_counter() - clicked
+        if cpu_time is not None:
+            # Peak memory always covers the whole host, pygame included
+            scope = "" if warmup_cpu is not None else " (including the host's start-up)"
+            print(f"{game.name} exited with code {exit_code} after {played:.1f} s, "
+                  f"using {cpu_time:.2f} s of CPU{scope} and at most {peak_rss / (1024 * 1024):.0f} MiB of memory")
+        pygame.event.post(pygame.event.Event(GAME_EXITED, game=game.name, exit_code=exit_code,
+                                             cpu_time=cpu_time, peak_rss=peak_rss))
+    
+    threading.Thread(target=watch, name=f"watch-{game.name}", daemon=True).start()
+    return process
 
 # Draw a fancy title
 def draw_title(screen, text, y_pos):
     shadow_offset = 2
     
     # Draw shadow
-    title_shadow = font_large.render(text, True, BLACK)
+    title_shadow = render_text(font_large, text, BLACK)
     shadow_rect = title_shadow.get_rect(center=(WIDTH // 2 + shadow_offset, y_pos + shadow_offset))
     screen.blit(title_shadow, shadow_rect)
     
     # Draw main text
-    title_text = font_large.render(text, True, WHITE)
+    title_text = render_text(font_large, text, WHITE)
     text_rect = title_text.get_rect(center=(WIDTH // 2, y_pos))
     screen.blit(title_text, text_rect)
 
+# Draw the background gradient and border once; every frame starts from a copy
+def create_background():
+    background = pygame.Surface((WIDTH, HEIGHT))
+    for y in range(HEIGHT):
+        # Create a gradient from dark gray to light gray
+        color_value = 80 + int(y / HEIGHT * 40)
+        pygame.draw.line(background, (color_value, color_value, color_value), (0, y), (WIDTH, y))
+    
+    # Draw a decorative border around the screen
+    pygame.draw.rect(background, WHITE, (0, 0, WIDTH, HEIGHT), 3, border_radius=4)
+    return background.convert()
+
 # Main function
 def main():
     # Parse command-line arguments
     import argparse
     parser = argparse.ArgumentParser(description="Game Collection Launcher")
     parser.add_argument("--launch", help="Launch a specific game directly")
+    parser.add_argument("--render-mode", choices=RENDER_MODES, default="event",
+                        help="Redraw only what changed after input, or the whole window every frame")
+    parser.add_argument("--host", action="store_true",
+                        help="Wait for a game on stdin and run it (used by the launcher for fast starts)")
     args = parser.parse_args()
     
+    if args.host:
+        run_host()
+        return
+    
     # Create window inside the main function to avoid scope issues
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption(TITLE)
@@ -288,13 +496,18 @@ def main():
     except:
         pass
     
+    # Warm up a game host while the menu is shown
+    host = GameHost()
+    host.spawn()
+    playing = None
+    
     # If launch argument is provided, directly launch that game
     if args.launch:
         games = find_games()
         for game in games:
             if game.name.lower() == args.launch.lower():
                 print(f"Directly launching {game.name}...")
-                launch_game(game, screen)
+                playing = launch_game(game, host)
                 break
         else:
             print(f"Game '{args.launch}' not found.")
@@ -318,21 +531,30 @@ def main():
         game_buttons.append(Button(x, y, 350, 80, ""))
     
     selected_game = None
+    background = create_background()
+    
+    # What the last presented frame showed, to work out which parts changed
+    shown_view = None
+    shown_hover = {}
+    redraw = False
     
     while running:
-        screen.fill(GRAY)
+        # Sleep until there is input unless every frame is redrawn or the last one is already out of date
+        if args.render_mode == "event" and shown_view is not None and not redraw:
+            events = [pygame.event.wait()] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+        
+        screen.blit(background, (0, 0))
         
-        # Draw background gradient
-        for y in range(HEIGHT):
-            # Create a gradient from dark gray to light gray
-            color_value = 80 + int(y / HEIGHT * 40)  
-            pygame.draw.line(screen, (color_value, color_value, color_value), (0, y), (WIDTH, y))
+        # Screen areas of the hoverable widgets drawn this frame, with their hover state
+        hover = {}
         
         # Handle events
         click = False
         mx, my = pygame.mouse.get_pos()
         
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
@@ -348,6 +570,13 @@ def main():
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     click = True
+            if event.type == GAME_EXITED:
+                # Get the next host ready while the player picks another game
+                playing = None
+                host.spawn()
+        
+        # The screen this frame shows; clicks handled while drawing it only take effect in the next one
+        drawn_view = (page, selected_game, playing)
         
         if selected_game:
             # Display game details screen
@@ -355,7 +584,7 @@ def main():
             pygame.draw.rect(screen, BLACK, (50, 100, WIDTH - 100, HEIGHT - 200), 2, border_radius=15)
             
             # Game title
-            title_text = font_large.render(selected_game.name, True, BLACK)
+            title_text = render_text(font_large, selected_game.name, BLACK)
             title_rect = title_text.get_rect(center=(WIDTH // 2, 130))
             screen.blit(title_text, title_rect)
             
@@ -374,18 +603,18 @@ def main():
                 pygame.draw.rect(screen, WHITE, placeholder_rect)
                 pygame.draw.rect(screen, BLACK, placeholder_rect, 1)
                 
-                no_img_text = font_small.render("No Preview Available", True, BLACK)
+                no_img_text = render_text(font_small, "No Preview Available", BLACK)
                 no_img_rect = no_img_text.get_rect(center=placeholder_rect.center)
                 screen.blit(no_img_text, no_img_rect)
             
             # Description
             if selected_game.description:
-                desc_text = font_small.render(selected_game.description[:80], True, BLACK)
+                desc_text = render_text(font_small, selected_game.description[:80], BLACK)
                 desc_rect = desc_text.get_rect(center=(WIDTH // 2, 370))
                 screen.blit(desc_text, desc_rect)
                 
                 if len(selected_game.description) > 80:
-                    desc_text2 = font_small.render(selected_game.description[80:160], True, BLACK)
+                    desc_text2 = render_text(font_small, selected_game.description[80:160], BLACK)
                     desc_rect2 = desc_text2.get_rect(center=(WIDTH // 2, 400))
                     screen.blit(desc_text2, desc_rect2)
             
@@ -395,14 +624,19 @@ def main():
             
             play_btn.check_hover((mx, my))
             back_btn.check_hover((mx, my))
-            play_btn.draw(screen)
             back_btn.draw(screen)
+            hover[tuple(back_btn.rect)] = back_btn.hovered
             
-            if play_btn.clicked((mx, my), click):
-                # Launch the game
-                pygame.display.quit()
-                screen = launch_game(selected_game, screen)
-                # Screen is re-initialized in the launch_game function
+            if playing is not None:
+                # One game at a time; the menu stays open behind it
+                running_text = render_text(font_small, "A game is running - press F10 in it to return", BLACK)
+                screen.blit(running_text, running_text.get_rect(center=(WIDTH // 2, HEIGHT - 170)))
+            else:
+                play_btn.draw(screen)
+                hover[tuple(play_btn.rect)] = play_btn.hovered
+                if play_btn.clicked((mx, my), click):
+                    # Launch the game
+                    playing = launch_game(selected_game, host)
             
             if back_btn.clicked((mx, my), click):
                 selected_game = None
@@ -412,13 +646,13 @@ def main():
             draw_title(screen, "Game Collection", 50)
             
             # Instructions
-            text_surf = font_medium.render("Select a game to play", True, WHITE)
+            text_surf = render_text(font_medium, "Select a game to play", WHITE)
             text_rect = text_surf.get_rect(center=(WIDTH // 2, 100))
             screen.blit(text_surf, text_rect)
             
             # Page indicator
             max_pages = (len(games) - 1) // games_per_page + 1
-            page_text = font_small.render(f"Page {page + 1}/{max_pages}", True, WHITE)
+            page_text = render_text(font_small, f"Page {page + 1}/{max_pages}", WHITE)
             screen.blit(page_text, (WIDTH // 2 - 40, HEIGHT - 30))
             
             # Draw game buttons for current page
@@ -453,6 +687,9 @@ def main():
                     thumb_x = btn.rect.x + btn.rect.width + 15
                     thumb_y = btn.rect.y
                     screen.blit(game.image, (thumb_x, thumb_y))
+                    hover[tuple(btn.rect.union(border_rect))] = btn.hovered
+                else:
+                    hover[tuple(btn.rect)] = btn.hovered
                 
                 # Handle click
                 if btn.clicked((mx, my), click):
@@ -463,6 +700,9 @@ def main():
             next_button.check_hover((mx, my))
             exit_button.check_hover((mx, my))
             
+            for button in (back_button, next_button, exit_button):
+                hover[tuple(button.rect)] = button.hovered
+            
             if page > 0:
                 back_button.draw(screen)
                 if back_button.clicked((mx, my), click):
@@ -477,13 +717,27 @@ def main():
             if exit_button.clicked((mx, my), click):
                 running = False
         
-        # Draw a decorative border around the screen    
-        pygame.draw.rect(screen, WHITE, (0, 0, WIDTH, HEIGHT), 3, border_radius=4)
-                
         # Update display
-        pygame.display.flip()
+        if args.render_mode == "continuous":
+            pygame.display.flip()
+            clock.tick(FPS)
+            continue
+        
+        # A new page or screen replaces everything, a hover change only its widget
+        exposed = any(event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED) for event in events)
+        if drawn_view != shown_view or exposed:
+            pygame.display.flip()
+        else:
+            dirty = [pygame.Rect(rect) for rect, hovered in hover.items() if shown_hover.get(rect) != hovered]
+            if dirty:
+                pygame.display.update(dirty)
+        shown_view = drawn_view
+        shown_hover = hover
+        redraw = (page, selected_game, playing) != drawn_view
+        # Bursts of mouse motion are still presented at most FPS times a second
         clock.tick(FPS)
 
+    host.close()
     pygame.quit()
 
 if __name__ == "__main__":